@@ -0,0 +1,826 @@
+#!/usr/bin/env python3
+# Import required modules
+import argparse
+import contextlib
+import csv
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from profile_hooks import add_profile_arguments, profile_mode, profiled
+
+# Number of untimed runs before the timed repetitions, and number of timed repetitions
+DEFAULT_WARMUP = 1
+DEFAULT_REPEAT = 5
+# Seed of the data generators, so every run benchmarks exactly the same data
+DEFAULT_SEED = 325
+# A benchmark whose best time is this fraction slower than the baseline is a regression
+DEFAULT_THRESHOLD = 0.10
+# Version of the results file layout, checked before comparing against a baseline
+RESULTS_VERSION = 1
+
+# A benchmark setup returns the function to time and the amount of work one call of it does
+Setup = Callable[[random.Random, float], Tuple[Callable[[], Any], int]]
+
+# Registered benchmarks, in the order they run:
+# name -> (unit of work, setup function, description, whether peak memory is measured)
+BENCHMARKS: Dict[str, Tuple[str, Setup, str, bool]] = {}
+
+def benchmark(name: str, unit: str, memory: bool = False) -> Callable[[Setup], Setup]:
+    """
+    Decorator that registers a benchmark setup function under a name.
+    
+    The setup function receives a seeded random.Random and a scale factor, builds
+    its data and returns (run, count): a function that does the work being
+    measured and the number of units (calls, rows, bytes...) one run processes.
+    Throughput is reported as count / time of the fastest run.
+    
+    Args:
+        name: Unique dotted name of the benchmark, e.g. 'q2.cache_result.hit'
+        unit: What count measures, e.g. 'calls' or 'bytes'
+        memory: Also measure the peak memory one run allocates, in an extra untimed run
+    
+    Returns:
+        A decorator that registers the setup function and returns it unchanged
+    """
+    def register(setup: Setup) -> Setup:
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark '{name}' is already registered")
+        BENCHMARKS[name] = (unit, setup, (setup.__doc__ or '').strip().split('\n')[0], memory)
+        return setup
+    return register
+
+def scaled(size: int, scale: float) -> int:
+    """
+    Scale the default size of a benchmark, keeping at least one unit of work.
+    
+    Args:
+        size: Size used at scale 1.0
+        scale: Scale factor from the command line
+    
+    Returns:
+        int: The scaled size
+    """
+    return max(1, int(size * scale))
+
+@contextlib.contextmanager
+def quiet_logging() -> Iterator[None]:
+    """
+    Route log records to a NullHandler while benchmarks run.
+    
+    q2_cache_result and q8_calculator_with_logging log every call, and configure
+    logging to stderr or a dated file when imported. Installing a handler on the
+    root logger first turns their basicConfig() calls into no-ops, so importing
+    them creates no log file. Records are still created and handled at INFO level,
+    so the benchmarks include the cost of logging, just not the terminal or disk I/O.
+    """
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    root.handlers = [logging.NullHandler()]
+    root.setLevel(logging.INFO)
+    try:
+        yield
+    finally:
+        root.handlers = handlers
+        root.setLevel(level)
+
+# Reproducible data generators
+
+def generate_numbers(rng: random.Random, count: int, low: int = -10**6, high: int = 10**6) -> List[int]:
+    """
+    Generate a list of random integers.
+    
+    Args:
+        rng: Seeded random number generator
+        count: Number of integers to generate
+        low, high: Inclusive range of the integers
+    
+    Returns:
+        List[int]: The generated integers
+    """
+    return [rng.randint(low, high) for _ in range(count)]
+
+def generate_shapes(rng: random.Random, count: int) -> List[Any]:
+    """
+    Generate an equal mix of q3 circles and rectangles with random positive sizes.
+    
+    Args:
+        rng: Seeded random number generator
+        count: Number of shapes to generate
+    
+    Returns:
+        List[Shape]: The generated shapes
+    """
+    from q3_shape_abc import Circle, Rectangle
+    return [Circle(rng.uniform(0.1, 100.0)) if i % 2 == 0
+            else Rectangle(rng.uniform(0.1, 100.0), rng.uniform(0.1, 100.0))
+            for i in range(count)]
+
+def generate_operations(rng: random.Random, count: int) -> List[Tuple[float, float, str]]:
+    """
+    Generate random (num1, num2, operation) arguments for the q8 calculate() function.
+    
+    Args:
+        rng: Seeded random number generator
+        count: Number of operations to generate
+    
+    Returns:
+        List[Tuple[float, float, str]]: The generated arguments
+    """
+    operations = ('add', 'subtract', 'multiply')
+    return [(rng.uniform(-1000.0, 1000.0), rng.uniform(-1000.0, 1000.0), rng.choice(operations))
+            for _ in range(count)]
+
+# Columns of the generated import data: a mix of ints, floats, bools, repeated and unique strings
+RECORD_FIELDS = ['id', 'name', 'age', 'city', 'score', 'active', 'email']
+_NAMES = ('John', 'Jane', 'Alice', 'Bob', 'Carol', 'Dave', 'Erin', 'Frank')
+_CITIES = ('New York', 'London', 'Paris', 'Tokyo', 'Berlin', 'Sydney')
+
+def generate_records(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    """
+    Generate records shaped like the files q9_data_importer_cli imports.
+    
+    Args:
+        rng: Seeded random number generator
+        count: Number of records to generate
+    
+    Returns:
+        List[Dict[str, Any]]: The generated records, with the keys in RECORD_FIELDS
+    """
+    records = []
+    for i in range(count):
+        name = rng.choice(_NAMES)
+        records.append({'id': i, 'name': name, 'age': rng.randint(18, 90),
+                        'city': rng.choice(_CITIES), 'score': round(rng.uniform(0, 100), 3),
+                        'active': rng.random() < 0.5, 'email': f'{name.lower()}{i}@example.com'})
+    return records
+
+def generate_printables(rng: random.Random, count: int) -> List[Any]:
+    """
+    Generate a random mix of q5 books and movies.
+    
+    Args:
+        rng: Seeded random number generator
+        count: Number of items to generate
+    
+    Returns:
+        List[Printable]: The generated items
+    """
+    from q5_printable_protocol import Book, Movie
+    return [Book(f'Book {rng.randint(1, 10**6)}', rng.choice(_NAMES)) if rng.random() < 0.5
+            else Movie(f'Movie {rng.randint(1, 10**6)}', rng.choice(_NAMES))
+            for _ in range(count)]
+
+def write_records(records: List[Dict[str, Any]], file_path: str) -> int:
+    """
+    Write generated records to a .csv or .json input file.
+    
+    Args:
+        records: Records from generate_records()
+        file_path: Path of the file to write; the extension selects the format
+    
+    Returns:
+        int: Size of the written file in bytes
+    """
+    with open(file_path, 'w', newline='') as f:
+        if file_path.endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        else:
+            json.dump(records, f)
+    return os.path.getsize(file_path)
+
+# Temporary directory for the files written by the q4 and q9 benchmarks, and the
+# resources of the running benchmark, both set by run_benchmarks()
+_scratch_directory: Optional[str] = None
+_resources: Optional[contextlib.ExitStack] = None
+
+def scratch_path(name: str) -> str:
+    """
+    Return a path in the temporary directory that is removed after the benchmarks run.
+    
+    Args:
+        name: File name within the directory
+    
+    Returns:
+        str: Path of the file
+    """
+    return os.path.join(_scratch_directory, name)
+
+def benchmark_resource(manager: Any) -> Any:
+    """
+    Enter a context manager, such as a server, that is exited once the running benchmark finishes.
+    
+    Args:
+        manager: The context manager
+    
+    Returns:
+        The value of entering it
+    """
+    return _resources.enter_context(manager)
+
+# q2: cache_result and the decorator stack
+
+def _identity(x):
+    return x
+
+def _power(base, exponent):
+    return base ** exponent
+
+def make_fibonacci(*decorators: Callable) -> Callable[[int], int]:
+    """
+    Build the q2 fibonacci() function under any stack of decorators.
+    
+    The recursive calls go through the decorated function, exactly as they do
+    for the module-level fibonacci() in q2_cache_result.
+    
+    Args:
+        decorators: Decorators to apply, outermost first (like stacked @ lines)
+    
+    Returns:
+        The decorated fibonacci function, with an empty cache
+    """
+    def fibonacci(n: int) -> int:
+        if n < 2:
+            return n
+        return decorated(n - 1) + decorated(n - 2)
+    decorated = fibonacci
+    for decorator in reversed(decorators):
+        decorated = decorator(decorated)
+    return decorated
+
+def _decorator_stacks() -> Dict[str, Tuple[Callable, ...]]:
+    # The layers of the q2 fibonacci/power stack, added one at a time
+    from q2_cache_result import cache_result, log_function, time_it
+    return {'plain': (), 'cache': (cache_result,), 'time+cache': (time_it, cache_result),
+            'log+time+cache': (log_function, time_it, cache_result)}
+
+@benchmark('q2.cache_result.miss', 'calls')
+def bench_cache_miss(rng: random.Random, scale: float):
+    """cache_result() calls with arguments not seen before"""
+    from q2_cache_result import cache_result
+    args = generate_numbers(rng, scaled(100_000, scale))
+    def run():
+        cached = cache_result(_identity)
+        for x in args:
+            cached(x)
+    return run, len(args)
+
+@benchmark('q2.cache_result.hit', 'calls')
+def bench_cache_hit(rng: random.Random, scale: float):
+    """cache_result() calls with cached arguments"""
+    from q2_cache_result import cache_result
+    args = generate_numbers(rng, 1000)
+    cached = cache_result(_identity)
+    for x in args:
+        cached(x)
+    args = args * scaled(100, scale)
+    def run():
+        for x in args:
+            cached(x)
+    return run, len(args)
+
+# Depth of the fibonacci benchmarks; each level of recursion uses one frame per decorator
+FIBONACCI_N = 150
+
+def _register_stack_benchmarks() -> None:
+    for stack_name in ('plain', 'cache', 'time+cache', 'log+time+cache'):
+        layers = 'no decorators' if stack_name == 'plain' else f'the {stack_name} decorators'
+        def bench_fibonacci(rng: random.Random, scale: float, stack_name=stack_name):
+            decorators = _decorator_stacks()[stack_name]
+            if not decorators:
+                # Without a cache the recursion is exponential, so use a depth it can finish
+                n, count = 20, scaled(5, scale)
+            else:
+                n, count = FIBONACCI_N, scaled(200, scale)
+            # Count every call, recursive ones included, so all stacks report time per call
+            calls = [0]
+            def counted(func):
+                def wrapper(*args):
+                    calls[0] += 1
+                    return func(*args)
+                return wrapper
+            make_fibonacci(counted, *decorators)(n)
+            def run():
+                # A fresh cache each time, so every value is computed once and then hit once
+                for _ in range(count):
+                    make_fibonacci(*decorators)(n)
+            return run, count * calls[0]
+        bench_fibonacci.__doc__ = f"fibonacci() calls, starting from an empty cache, under {layers}"
+        benchmark(f'q2.fibonacci.{stack_name}', 'calls')(bench_fibonacci)
+        
+        def bench_power(rng: random.Random, scale: float, stack_name=stack_name):
+            decorators = _decorator_stacks()[stack_name]
+            power = _power
+            for decorator in reversed(decorators):
+                power = decorator(power)
+            args = [(rng.randint(2, 9), rng.randint(0, 20)) for _ in range(200)]
+            args = args * scaled(500, scale)
+            def run():
+                for base, exponent in args:
+                    power(base, exponent)
+            return run, len(args)
+        bench_power.__doc__ = f"power() calls, mostly cache hits, under {layers}"
+        benchmark(f'q2.power.{stack_name}', 'calls')(bench_power)
+
+_register_stack_benchmarks()
+
+# q3: Shape area and perimeter
+
+@benchmark('q3.shape.area_perimeter', 'shapes')
+def bench_shapes(rng: random.Random, scale: float):
+    """area() and perimeter() of a mix of circles and rectangles"""
+    shapes = generate_shapes(rng, scaled(500_000, scale))
+    def run():
+        return sum([shape.area() + shape.perimeter() for shape in shapes])
+    return run, len(shapes)
+
+# q6: DataProcessor throughput
+
+def _register_processor_benchmarks() -> None:
+    from q6_data_processor_protocol import EvenFilter, SquareProcessor
+    for name, processor in (('even_filter', EvenFilter()), ('square', SquareProcessor())):
+        def bench_processor(rng: random.Random, scale: float, processor=processor):
+            from q6_data_processor_protocol import apply_processor
+            numbers = generate_numbers(rng, scaled(1_000_000, scale))
+            return (lambda: apply_processor(processor, numbers)), len(numbers)
+        bench_processor.__doc__ = f"apply_processor() with {type(processor).__name__} on a list of ints"
+        benchmark(f'q6.processor.{name}', 'items')(bench_processor)
+
+_register_processor_benchmarks()
+
+# q8: calculate()
+
+@benchmark('q8.calculate', 'ops')
+def bench_calculate(rng: random.Random, scale: float):
+    """calculate() with random operands and operations, logging included"""
+    from q8_calculator_with_logging import calculate
+    operations = generate_operations(rng, scaled(50_000, scale))
+    def run():
+        for num1, num2, operation in operations:
+            calculate(num1, num2, operation)
+    return run, len(operations)
+
+# q9: import and export
+
+# Number of rows in the generated q9 input files at scale 1.0
+IMPORT_ROWS = 100_000
+
+
+def _register_import_benchmarks() -> None:
+    for name, extension, options in (('csv', '.csv', {}), ('csv_typed', '.csv', {'schema': {}}),
+                                     ('csv_pushdown', '.csv', {'select': ['name', 'score'],
+                                                               'where': ['age>=60']}),
+                                     ('json', '.json', {})):
+        def bench_import(rng: random.Random, scale: float, name=name, extension=extension, options=options):
+            from q9_data_importer_cli import import_file
+            file_path = scratch_path(f'import.{name}{extension}')
+            size = write_records(generate_records(rng, scaled(IMPORT_ROWS, scale)), file_path)
+            
+            class DiscardWriter:
+                # Receives the parsed rows and drops them, so only reading is measured
+                def write_batch(self, rows):
+                    pass
+            return (lambda: import_file(file_path, DiscardWriter(), **options)), size
+        bench_import.__doc__ = f"import_file() reading a generated {extension[1:]} file ({name})"
+        benchmark(f'q9.import.{name}', 'bytes')(bench_import)
+
+def _register_export_benchmarks() -> None:
+    from q9_data_importer_cli import OUTPUT_FORMATS
+    for output_format in OUTPUT_FORMATS:
+        def bench_export(rng: random.Random, scale: float, output_format=output_format):
+            from q9_data_importer_cli import make_writer, open_output
+            records = generate_records(rng, scaled(IMPORT_ROWS, scale))
+            file_path = scratch_path(f'export.{output_format}')
+            
+            def run():
+                with open_output(file_path, output_format) as out:
+                    writer = make_writer(out, output_format)
+                    for start in range(0, len(records), 10_000):
+                        writer.write_batch(records[start:start + 10_000])
+                    writer.close()
+            # Throughput is measured in bytes of output, which differs by format
+            run()
+            return run, os.path.getsize(file_path)
+        bench_export.__doc__ = f"Writing generated rows as {output_format} output"
+        benchmark(f'q9.export.{output_format}', 'bytes')(bench_export)
+
+_register_import_benchmarks()
+_register_export_benchmarks()
+
+# q4: concurrent and cached fetches, streaming records
+
+# Number of API sources fetched at scale 1.0, and the latency of the stub server in seconds
+API_SOURCES = 100
+API_DELAY = 0.01
+
+def _api_sources(scale: float) -> List[Any]:
+    from q4_data_source_abc import APIDataSource, ConnectionPool, StubAPIServer
+    server = benchmark_resource(StubAPIServer(delay=API_DELAY))
+    pool = ConnectionPool()
+    _resources.callback(pool.close)
+    return [APIDataSource(f'{server.url}/users/{i}', pool) for i in range(scaled(API_SOURCES, scale))]
+
+@benchmark('q4.api.sequential', 'fetches')
+def bench_api_sequential(rng: random.Random, scale: float):
+    """fetch_data() of API sources one after the other, from a stub server with latency"""
+    sources = _api_sources(scale)
+    def run():
+        for source in sources:
+            source.fetch_data()
+    return run, len(sources)
+
+@benchmark('q4.api.fetch_many', 'fetches')
+def bench_api_fetch_many(rng: random.Random, scale: float):
+    """fetch_many() of the same API sources, 50 at a time"""
+    from q4_data_source_abc import fetch_many
+    sources = _api_sources(scale)
+    def run():
+        results = fetch_many(sources, concurrency=50)
+        if not all(result.ok for result in results):
+            raise RuntimeError(f"fetch_many() failed: {next(r.error for r in results if not r.ok)!r}")
+    return run, len(sources)
+
+def _json_source(rng: random.Random, scale: float) -> Any:
+    from q4_data_source_abc import FileDataSource
+    file_path = scratch_path('source.json')
+    write_records(generate_records(rng, scaled(IMPORT_ROWS, scale)), file_path)
+    return FileDataSource(file_path)
+
+@benchmark('q4.file.fetch_data', 'records', memory=True)
+def bench_file_fetch_data(rng: random.Random, scale: float):
+    """FileDataSource.fetch_data() parsing a generated JSON file, i.e. an uncached fetch"""
+    source = _json_source(rng, scale)
+    return source.fetch_data, scaled(IMPORT_ROWS, scale)
+
+@benchmark('q4.file.iter_records', 'records', memory=True)
+def bench_file_iter_records(rng: random.Random, scale: float):
+    """FileDataSource.iter_records() streaming the same file in batches"""
+    source = _json_source(rng, scale)
+    def run():
+        for _ in source.iter_records():
+            pass
+    return run, scaled(IMPORT_ROWS, scale)
+
+@benchmark('q4.cached.hit', 'fetches')
+def bench_cached_hit(rng: random.Random, scale: float):
+    """CachedDataSource.fetch_data() of the same file answered from the cache"""
+    from q4_data_source_abc import CachedDataSource
+    source = CachedDataSource(_json_source(rng, scale))
+    source.fetch_data()
+    count = 10_000
+    def run():
+        for _ in range(count):
+            source.fetch_data()
+    return run, count
+
+# q5: printing catalogs
+
+def _printables(rng: random.Random, scale: float) -> List[Any]:
+    return generate_printables(rng, scaled(500_000, scale))
+
+@benchmark('q5.print_item', 'items')
+def bench_print_item(rng: random.Random, scale: float):
+    """print_item() called on each item, with stdout going to os.devnull"""
+    from q5_printable_protocol import print_item
+    items = _printables(rng, scale)
+    devnull = benchmark_resource(open(os.devnull, 'w'))
+    def run():
+        with contextlib.redirect_stdout(devnull):
+            for item in items:
+                print_item(item)
+    return run, len(items)
+
+@benchmark('q5.print_items', 'items')
+def bench_print_items(rng: random.Random, scale: float):
+    """print_items() rendering the same items in chunks to os.devnull"""
+    from q5_printable_protocol import print_items
+    items = _printables(rng, scale)
+    devnull = benchmark_resource(open(os.devnull, 'w'))
+    return (lambda: print_items(items, devnull)), len(items)
+
+# Running, saving and comparing
+
+def time_benchmark(run: Callable[[], Any], warmup: int = DEFAULT_WARMUP,
+                   repeat: int = DEFAULT_REPEAT) -> List[float]:
+    """
+    Time a benchmark function after warming it up.
+    
+    Like timeit, the garbage collector is paused during each timed run so a
+    collection triggered by earlier work doesn't land in a random repetition.
+    
+    Args:
+        run: Function that does the measured work
+        warmup: Number of untimed runs first
+        repeat: Number of timed runs
+    
+    Returns:
+        List[float]: Duration of each timed run in seconds
+    """
+    for _ in range(warmup):
+        run()
+    times = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+            if gc_was_enabled:
+                gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return times
+
+def measure_peak_memory(run: Callable[[], Any]) -> int:
+    """
+    Measure the peak memory allocated by one run of a benchmark function with tracemalloc.
+    
+    Args:
+        run: Function that does the measured work
+    
+    Returns:
+        int: Peak traced memory during the run in bytes, above what was allocated before it
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if started:
+            tracemalloc.stop()
+
+def run_benchmarks(names: List[str], seed: int = DEFAULT_SEED, scale: float = 1.0,
+                   warmup: int = DEFAULT_WARMUP, repeat: int = DEFAULT_REPEAT,
+                   profile: Optional[str] = None, profile_output: Optional[str] = None,
+                   progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Run benchmarks and collect their results.
+    
+    Every benchmark gets its own random generator seeded with seed, so its data
+    is the same whichever other benchmarks are selected. Benchmarks registered
+    with memory=True also report 'peak_bytes' from an extra untimed run.
+    
+    Args:
+        names: Names of the registered benchmarks to run
+        seed: Seed of the data generators
+        scale: Factor applied to the default size of every benchmark
+        warmup: Number of untimed runs before timing
+        repeat: Number of timed runs
+        profile: Optional profile mode for the timed runs of each benchmark (see profile_hooks)
+        profile_output: Optional file name prefix for the raw profiles, suffixed with the benchmark name
+        progress: Optional callback called as progress(name, result) after each benchmark
+    
+    Returns:
+        Dict[str, Any]: Results with 'version', 'meta' and 'results' keys, ready to save as JSON
+    """
+    global _scratch_directory, _resources
+    profile = profile_mode(profile)
+    results = {}
+    with quiet_logging(), tempfile.TemporaryDirectory(prefix='q_bench_') as _scratch_directory:
+        for name in names:
+            unit, setup, _, memory = BENCHMARKS[name]
+            with contextlib.ExitStack() as _resources:
+                run, count = setup(random.Random(f'{seed}:{name}'), scale)
+                output = f'{profile_output}.{name}' if profile_output else None
+                with profiled(profile, output, label=name):
+                    times = time_benchmark(run, warmup, repeat)
+                best = min(times)
+                results[name] = {'unit': unit, 'count': count, 'best': best,
+                                 'median': statistics.median(times), 'mean': statistics.fmean(times),
+                                 'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+                                 'rate': count / best if best > 0 else float('inf')}
+                if memory:
+                    results[name]['peak_bytes'] = measure_peak_memory(run)
+            if progress is not None:
+                progress(name, results[name])
+    _scratch_directory = _resources = None
+    return {'version': RESULTS_VERSION,
+            'meta': {'timestamp': datetime.now().isoformat(timespec='seconds'),
+                     'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                     'platform': platform.platform(), 'cpus': os.cpu_count(), 'seed': seed,
+                     'scale': scale, 'warmup': warmup, 'repeat': repeat, 'profile': profile},
+            'results': results}
+
+def load_results(file_path: str) -> Dict[str, Any]:
+    """
+    Load benchmark results saved as JSON.
+    
+    Args:
+        file_path: Path to the results file
+    
+    Returns:
+        Dict[str, Any]: The results
+    
+    Raises:
+        ValueError: If the file is not a results file this version can read
+    """
+    try:
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read benchmark results '{file_path}': {e}")
+    if not isinstance(data, dict) or data.get('version') != RESULTS_VERSION:
+        raise ValueError(f"'{file_path}' is not a version {RESULTS_VERSION} benchmark results file")
+    return data
+
+def save_results(data: Dict[str, Any], file_path: str) -> None:
+    """
+    Save benchmark results as JSON.
+    
+    Args:
+        data: Results from run_benchmarks()
+        file_path: Path of the file to write
+    """
+    with open(file_path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare benchmark results against a baseline.
+    
+    Benchmarks are compared on their best time per unit of work, so a baseline
+    recorded at a different --scale still compares fairly. Benchmarks that
+    measure memory are also compared on their peak memory, as a separate entry
+    named '<name> (memory)'. Only benchmarks present in both results are compared.
+    
+    Args:
+        current: Results from run_benchmarks()
+        baseline: Earlier results to compare against
+        threshold: Fraction a benchmark may be slower before it counts as a regression
+    
+    Returns:
+        List[Dict[str, Any]]: One entry per comparison with 'name', 'change'
+        (relative change in time per unit or in peak memory; positive is worse)
+        and 'status' ('regression', 'improvement' or 'ok')
+    """
+    def compare(name: str, change: float) -> Dict[str, Any]:
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        return {'name': name, 'change': change, 'status': status}
+    
+    comparisons = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None or base['rate'] <= 0:
+            continue
+        comparisons.append(compare(name, base['rate'] / result['rate'] - 1.0))
+        if base.get('peak_bytes') and 'peak_bytes' in result:
+            comparisons.append(compare(f'{name} (memory)', result['peak_bytes'] / base['peak_bytes'] - 1.0))
+    return comparisons
+
+def format_rate(rate: float, unit: str) -> str:
+    """
+    Format a throughput for display, e.g. '1.23M calls/s' or '45.6 MB/s'.
+    
+    Args:
+        rate: Units of work per second
+        unit: What the units are
+    
+    Returns:
+        str: The formatted throughput
+    """
+    if unit == 'bytes':
+        return f"{rate / 1e6:.1f} MB/s"
+    for factor, suffix in ((1e9, 'G'), (1e6, 'M'), (1e3, 'k')):
+        if rate >= factor:
+            return f"{rate / factor:.2f}{suffix} {unit}/s"
+    return f"{rate:.1f} {unit}/s"
+
+def main():
+    """
+    Main function that sets up the command-line interface and runs the benchmarks.
+    Uses argparse to select benchmarks, save their results and compare them to a baseline.
+    """
+    # Create the argument parser with a description
+    parser = argparse.ArgumentParser(description='Performance benchmarks for the q2-q9 modules')
+    
+    # Add optional arguments:
+    # filter, list: Which benchmarks to run
+    # scale, repeat, warmup, seed: How much work each benchmark does and how it is timed
+    # output, baseline, threshold: Saving results and checking them for regressions
+    # profile, profile-output: Optional cProfile/tracemalloc report of each benchmark
+    parser.add_argument('-k', '--filter', dest='patterns', action='append', default=[],
+                       help='Only run benchmarks whose name matches this regular expression; may be repeated')
+    parser.add_argument('--list', action='store_true', help='List the benchmarks and exit')
+    parser.add_argument('--scale', type=float, default=1.0,
+                       help='Multiply the amount of work of every benchmark (default: 1.0)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                       help=f'Timed runs per benchmark; the fastest is reported (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP,
+                       help=f'Untimed runs before timing (default: {DEFAULT_WARMUP})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                       help=f'Seed of the data generators (default: {DEFAULT_SEED})')
+    parser.add_argument('--output', help='Save the results as JSON to this file')
+    parser.add_argument('--baseline',
+                       help='Compare against results saved with --output and exit 1 on a regression')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help='Fraction slower than the baseline that counts as a regression '
+                            f'(default: {DEFAULT_THRESHOLD})')
+    add_profile_arguments(parser)
+    
+    # Parse the command-line arguments
+    args = parser.parse_args()
+    
+    try:
+        patterns = [re.compile(pattern) for pattern in args.patterns]
+    except re.error as e:
+        print(f"Error: Invalid --filter pattern: {e}")
+        sys.exit(1)
+    names = [name for name in BENCHMARKS if not patterns or any(p.search(name) for p in patterns)]
+    if args.list:
+        for name in names:
+            description = BENCHMARKS[name][2]
+            print(f"{name:<32} {description}")
+        return
+    if not names:
+        print("Error: No benchmarks match --filter")
+        sys.exit(1)
+    if args.scale <= 0 or args.repeat <= 0 or args.warmup < 0 or args.threshold < 0:
+        print("Error: --scale, --repeat and --threshold must be positive and --warmup not negative")
+        sys.exit(1)
+    
+    # Load the baseline first, so a bad path is reported before the benchmarks run
+    try:
+        baseline = load_results(args.baseline) if args.baseline else None
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    def progress(name: str, result: Dict[str, Any]) -> None:
+        memory = f"   peak {result['peak_bytes'] / 2**20:8.1f} MiB" if 'peak_bytes' in result else ''
+        print(f"{name:<32} {format_rate(result['rate'], result['unit']):>18}   "
+              f"best {result['best'] * 1000:9.2f} ms   median {result['median'] * 1000:9.2f} ms{memory}",
+              flush=True)
+    
+    try:
+        data = run_benchmarks(names, args.seed, args.scale, args.warmup, args.repeat,
+                              args.profile, args.profile_output, progress)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if args.output:
+        save_results(data, args.output)
+    
+    if baseline is not None:
+        comparisons = compare_results(data, baseline, args.threshold)
+        print(f"\nCompared with {args.baseline} ({baseline['meta']['timestamp']}), "
+              f"threshold {args.threshold:.0%}:")
+        for comparison in comparisons:
+            print(f"{comparison['name']:<32} {comparison['change']:+8.1%}   {comparison['status']}")
+        regressions = [c['name'] for c in comparisons if c['status'] == 'regression']
+        if regressions:
+            print(f"Error: {len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
+
+# Example usage:
+# python benchmarks.py --list
+# [Lists the benchmarks with a one-line description each]
+#
+# python benchmarks.py -k q2.cache_result
+# q2.cache_result.miss             ...M calls/s   best ... ms   median ... ms
+# q2.cache_result.hit              ...M calls/s   best ... ms   median ... ms
+#
+# python benchmarks.py -k 'q4|q5'
+# [Compares sequential and concurrent API fetches, cached and uncached file
+#  fetches, the peak memory of fetch_data() and iter_records(), and
+#  print_item() in a loop against print_items()]
+#
+# python benchmarks.py --output baseline.json
+# [Runs every benchmark and saves the results as the baseline]
+#
+# python benchmarks.py --baseline baseline.json --threshold 0.05
+# [Runs every benchmark again, prints the change against baseline.json and
+#  exits with status 1 if any benchmark became more than 5% slower]
+#
+# python benchmarks.py -k q9.import --scale 0.1 --profile cprofile
+# [Profiles the timed runs of each q9 import benchmark; Q_PROFILE=cprofile does the same]
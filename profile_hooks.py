@@ -0,0 +1,137 @@
+# Import required modules
+import argparse
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tracemalloc
+from typing import Iterator, Optional, TextIO
+
+# Environment variables that switch profiling on without changing the command line:
+#   Q_PROFILE=cprofile     Profile function calls with cProfile
+#   Q_PROFILE=tracemalloc  Trace memory allocations with tracemalloc
+#   Q_PROFILE_OUTPUT=path  Also save the raw profile (pstats file or tracemalloc snapshot)
+PROFILE_ENV = 'Q_PROFILE'
+PROFILE_OUTPUT_ENV = 'Q_PROFILE_OUTPUT'
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+# Number of functions or allocation sites shown in a profile report
+DEFAULT_REPORT_LIMIT = 20
+# Number of stack frames tracemalloc records for each allocation
+TRACEMALLOC_FRAMES = 1
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the --profile and --profile-output options to a command-line parser.
+    
+    Args:
+        parser: The parser of the command-line interface to profile
+    """
+    parser.add_argument('--profile', choices=PROFILE_MODES,
+                       help=f'Profile the run with cProfile or tracemalloc and report to stderr '
+                            f'(default: ${PROFILE_ENV}, if set)')
+    parser.add_argument('--profile-output',
+                       help=f'Also save the raw profile to this file (default: ${PROFILE_OUTPUT_ENV}, if set)')
+
+def profile_mode(mode: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve the profiling mode from an explicit value or the environment.
+    
+    Args:
+        mode: Mode given on the command line, or None to use the Q_PROFILE variable
+    
+    Returns:
+        Optional[str]: 'cprofile', 'tracemalloc' or None when profiling is off
+    
+    Raises:
+        ValueError: If the mode is not one of PROFILE_MODES
+    """
+    if mode is None:
+        mode = os.environ.get(PROFILE_ENV, '').strip().lower() or None
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}' (use {' or '.join(PROFILE_MODES)})")
+    return mode
+
+@contextlib.contextmanager
+def profiled(mode: Optional[str] = None, output: Optional[str] = None, label: Optional[str] = None,
+             stream: Optional[TextIO] = None, limit: int = DEFAULT_REPORT_LIMIT) -> Iterator[None]:
+    """
+    Profile the body of a with statement when profiling is switched on.
+    
+    Without a mode and without Q_PROFILE set this does nothing, so it can wrap
+    the work of any command-line interface or benchmark at no cost. The report
+    goes to stderr so it never mixes with data written to stdout.
+    
+    Args:
+        mode: 'cprofile' or 'tracemalloc', or None to use the Q_PROFILE variable
+        output: File to save the raw profile to, or None to use Q_PROFILE_OUTPUT
+        label: Name of the profiled work shown in the report header
+        stream: Stream the report is written to (default: sys.stderr)
+        limit: Number of functions or allocation sites in the report
+    
+    Raises:
+        ValueError: If the mode is not one of PROFILE_MODES
+    """
+    mode = profile_mode(mode)
+    if mode is None:
+        yield
+        return
+    if output is None:
+        output = os.environ.get(PROFILE_OUTPUT_ENV) or None
+    stream = stream if stream is not None else sys.stderr
+    header = f"Profile ({mode})" + (f" of {label}" if label else "")
+    
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            report = io.StringIO()
+            stats = pstats.Stats(profiler, stream=report)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+            print(f"{header}:\n{report.getvalue()}", file=stream)
+            if output:
+                stats.dump_stats(output)
+        return
+    
+    # tracemalloc may already be running (python -X tracemalloc), in which case leave it on
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        # Leave out the allocations of tracemalloc and of this function
+        exclude = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        snapshot = tracemalloc.take_snapshot().filter_traces(exclude)
+        baseline = baseline.filter_traces(exclude)
+        if started:
+            tracemalloc.stop()
+        # Report what the profiled work allocated and still holds, by source line
+        lines = [f"{header}: peak {peak / 2**20:.1f} MiB traced, {current / 2**20:.1f} MiB at exit"]
+        for stat in snapshot.compare_to(baseline, 'lineno')[:limit]:
+            lines.append(f"  {stat}")
+        print('\n'.join(lines) + '\n', file=stream)
+        if output:
+            snapshot.dump(output)
+
+# Example usage:
+# Q_PROFILE=cprofile python q9_data_importer_cli.py data.csv
+# [Outputs the data, then the 20 functions with the most cumulative time on stderr]
+#
+# python q9_data_importer_cli.py big.csv --format jsonl --profile tracemalloc > /dev/null
+# Profile (tracemalloc): peak 12.3 MiB traced, 0.1 MiB at exit
+#   .../q9_data_importer_cli.py:560: size=...
+#
+# python q8_calculator_with_logging.py 5 3 add --profile cprofile --profile-output calc.prof
+# [Saves the profile to calc.prof; inspect it with python -m pstats calc.prof]
+#
+# From Python:
+# with profiled('cprofile', label='import'):
+#     import_file('data.csv', writer)
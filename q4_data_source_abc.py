@@ -1,5 +1,39 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+import asyncio
+import http.client
 import json
+import os
+import sys
+import threading
+import time
+import weakref
+
+# Default number of sources fetched at the same time by fetch_many()
+DEFAULT_CONCURRENCY = 50
+# Default number of pooled connections per host, and their socket timeout in seconds
+DEFAULT_POOL_SIZE = 50
+DEFAULT_HTTP_TIMEOUT = 10.0
+# Default number of seconds a cached response of a non-file source stays fresh
+DEFAULT_CACHE_TTL = 1.0
+# Default number of records per batch yielded by iter_records()
+DEFAULT_BATCH_SIZE = 1000
+# Number of characters read at a time when streaming a JSON file
+STREAM_CHUNK_SIZE = 1 << 20
+# Number of elements of a long list measured by estimate_size()
+ESTIMATE_SAMPLE_SIZE = 1000
+
+# Thread pool afetch_data() runs blocking fetches in; afetch_many() sets its own
+# for the fetches it starts, otherwise the event loop's default pool is used
+_fetch_executor = ContextVar('_fetch_executor', default=None)
+
+# Outcome of a fetch claimed with DataCache.get_or_claim() that ended without data
+# or an error (e.g. it was cancelled); the callers waiting for it fetch again
+_ABANDONED = object()
 
 class DataSource(ABC):
     """
@@ -16,6 +50,140 @@ class DataSource(ABC):
             The fetched data (format depends on the implementation)
         """
         pass
+    
+    async def afetch_data(self):
+        """
+        Fetch data from the source without blocking the event loop.
+        By default fetch_data() runs in a thread pool (the one of afetch_many(), or
+        the event loop's default one); sources with a native asynchronous client
+        can override this method.
+        
+        Returns:
+            The fetched data (format depends on the implementation)
+        """
+        return await asyncio.get_running_loop().run_in_executor(_fetch_executor.get(), self.fetch_data)
+    
+    def iter_records(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Yield the records of the source in batches.
+        By default the whole dataset is fetched with fetch_data() and then split up;
+        sources that can read incrementally override this to keep memory
+        proportional to the batch size.
+        
+        Args:
+            batch_size: Maximum number of records per batch
+            
+        Yields:
+            Lists of at most batch_size records
+        """
+        data = self.fetch_data()
+        if not isinstance(data, list):
+            data = [data]
+        for start in range(0, len(data), batch_size):
+            yield data[start:start + batch_size]
+
+def iter_json_array(file, batch_size=DEFAULT_BATCH_SIZE, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Parse a JSON array from a text file incrementally, yielding its elements in batches.
+    Only one chunk of the file and one batch of elements are held in memory at a time.
+    A document that isn't an array is yielded as a single one-element batch.
+    
+    Args:
+        file: Text file positioned at the start of the JSON document
+        batch_size: Maximum number of elements per batch
+        chunk_size: Number of characters to read at a time
+        
+    Yields:
+        Lists of at most batch_size elements
+        
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size)
+    pos = 0
+    eof = not buffer
+    
+    def fill():
+        # Drop what was already parsed and append the next chunk
+        nonlocal buffer, pos, eof
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+    
+    def skip(chars):
+        # Skip the given characters, reading more input as needed
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+    
+    skip(' \t\r\n')
+    if buffer[pos:pos + 1] != '[':
+        # Not an array: parse the whole document
+        while not eof:
+            fill()
+        yield [json.loads(buffer[pos:])]
+        return
+    pos += 1
+    
+    batch = []
+    # Elements and commas must alternate: '[1,,2]', '[,1]', '[1,]' and '[1 2]' are invalid
+    expect_value = True
+    after_comma = False
+    while True:
+        if pos >= len(buffer) or buffer[pos] in ' \t\r\n':
+            skip(' \t\r\n')
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+        char = buffer[pos]
+        if not expect_value:
+            if char == ']':
+                break
+            if char != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            expect_value = after_comma = True
+            continue
+        if char == ']' and not after_comma:
+            break
+        if char in ',]':
+            raise json.JSONDecodeError("Expecting value", buffer, pos)
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            # A value cut off by the end of the buffer (like '1.5' of '1.5e3') may continue
+            # in the next chunk, so it only counts once a delimiter follows it
+            complete = eof or (end < len(buffer) and buffer[end] in ' \t\r\n,]')
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            fill()
+            continue
+        pos = end
+        batch.append(value)
+        if end < len(buffer) and buffer[end] == ',':
+            # The usual case of a comma right after the element
+            pos += 1
+            after_comma = True
+        else:
+            expect_value = after_comma = False
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+    
+    # Only whitespace may follow the closing bracket
+    pos += 1
+    skip(' \t\r\n')
+    if pos < len(buffer):
+        raise json.JSONDecodeError("Extra data", buffer, pos)
 
 class FileDataSource(DataSource):
     """
@@ -41,36 +209,705 @@ class FileDataSource(DataSource):
         """
         with open(self.file_path, 'r') as file:
             return json.load(file)
+    
+    def iter_records(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Stream the records of the JSON array in the file, batch by batch.
+        
+        Args:
+            batch_size: Maximum number of records per batch
+            
+        Yields:
+            Lists of at most batch_size records
+        """
+        with open(self.file_path, 'r') as file:
+            yield from iter_json_array(file, batch_size)
+
+class ConnectionPool:
+    """
+    A thread-safe pool of keep-alive HTTP connections, shared by API data sources.
+    Connections are reused across requests to the same host instead of being
+    opened and closed for every fetch.
+    """
+    
+    def __init__(self, max_per_host=DEFAULT_POOL_SIZE, timeout=DEFAULT_HTTP_TIMEOUT):
+        """
+        Initialize an empty pool.
+        
+        Args:
+            max_per_host: Maximum number of open connections to each host
+            timeout: Socket timeout of each connection in seconds
+        """
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._slots = {}
+    
+    def _host_state(self, key):
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+                self._idle[key] = []
+            return self._slots[key], self._idle[key]
+    
+    def get(self, url):
+        """
+        Send a GET request over a pooled connection and return the response body.
+        A reused connection that the server has since closed is retried once,
+        always on a new connection since the other idle ones may be stale too.
+        
+        Args:
+            url: The http:// or https:// URL to fetch
+            
+        Returns:
+            The response body as bytes
+            
+        Raises:
+            ConnectionError: If the server responds with a status other than 200
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        slots, idle = self._host_state(key)
+        
+        with slots:
+            for attempt in range(2):
+                with self._lock:
+                    conn = idle.pop() if idle and attempt == 0 else None
+                reused = conn is not None
+                if conn is None:
+                    connection_class = (http.client.HTTPSConnection if parts.scheme == 'https'
+                                        else http.client.HTTPConnection)
+                    conn = connection_class(parts.hostname, parts.port, timeout=self.timeout)
+                try:
+                    conn.request('GET', path)
+                    response = conn.getresponse()
+                    body = response.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    conn.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                with self._lock:
+                    idle.append(conn)
+                if response.status != 200:
+                    raise ConnectionError(f"GET {url} returned HTTP {response.status}")
+                return body
+    
+    def close(self):
+        """
+        Close all idle connections.
+        """
+        with self._lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+                connections.clear()
 
 class APIDataSource(DataSource):
     """
     Concrete implementation of DataSource for fetching from APIs.
-    Implements the required fetch_data() method to simulate API responses.
+    Implements the required fetch_data() method to simulate API responses,
+    or to fetch real ones when given a ConnectionPool.
+    
+    Paginated endpoints are read page by page with iter_records(). With offset
+    pagination each page is requested with ?offset=N&limit=M and the last page
+    is the first one with fewer than M records. With cursor pagination pages are
+    requested with ?cursor=C&limit=M and answer {"records": [...], "next_cursor": C},
+    where a null cursor marks the last page.
     """
     
-    def __init__(self, endpoint):
+    def __init__(self, endpoint, pool=None, pagination='offset'):
         """
         Initialize an API data source with a given endpoint.
         
         Args:
             endpoint: The API endpoint URL to fetch from
+            pool: Optional ConnectionPool; without one the response is simulated
+            pagination: How iter_records() pages through the endpoint ('offset' or 'cursor')
         """
+        if pagination not in ('offset', 'cursor'):
+            raise ValueError("Pagination must be 'offset' or 'cursor'")
         self.endpoint = endpoint
+        self.pool = pool
+        self.pagination = pagination
     
     def fetch_data(self):
         """
-        Simulate fetching data from an API endpoint.
+        Fetch data from the API endpoint, or simulate it if there is no pool.
         
         Returns:
-            Simulated API response data
+            The parsed JSON response, or simulated API response data
         """
+        if self.pool is not None:
+            return json.loads(self.pool.get(self.endpoint))
+        
         # Simulate API response
-        if "users" in self.endpoint:
-            return [
-                {"id": 1, "name": "John Doe"},
-                {"id": 2, "name": "Jane Smith"}
-            ]
-        return [{"error": "Unknown endpoint"}]
+        return simulated_response(self.endpoint)
+    
+    def _page_url(self, **params):
+        parts = urlsplit(self.endpoint)
+        query = '&'.join(filter(None, [parts.query, urlencode(params)]))
+        return urlunsplit(parts._replace(query=query))
+    
+    def _fetch_page(self, position, batch_size):
+        """
+        Fetch one page.
+        
+        Args:
+            position: Offset or cursor of the page (None for the first cursor page)
+            batch_size: Number of records per page
+            
+        Returns:
+            A (records, next position) tuple; the next position is None after the last page
+        """
+        if self.pagination == 'offset':
+            records = json.loads(self.pool.get(self._page_url(offset=position, limit=batch_size)))
+            return records, (position + len(records) if len(records) == batch_size else None)
+        params = {'limit': batch_size}
+        if position is not None:
+            params['cursor'] = position
+        page = json.loads(self.pool.get(self._page_url(**params)))
+        return page['records'], page.get('next_cursor')
+    
+    def iter_records(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Page through the endpoint, yielding one page per batch.
+        The next page is requested in the background while the current one is
+        being consumed, so at most two pages are held in memory.
+        Without a pool the simulated response is split into batches instead.
+        
+        Args:
+            batch_size: Number of records per page
+            
+        Yields:
+            Lists of at most batch_size records
+        """
+        if self.pool is None:
+            yield from super().iter_records(batch_size)
+            return
+        
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            page = prefetcher.submit(self._fetch_page, 0 if self.pagination == 'offset' else None, batch_size)
+            while page is not None:
+                records, position = page.result()
+                page = None if position is None else prefetcher.submit(self._fetch_page, position, batch_size)
+                if records:
+                    yield records
+
+def stub_records(offset, limit, total):
+    """
+    Build a page of the collection served by StubAPIServer.
+    
+    Args:
+        offset: Index of the first record
+        limit: Maximum number of records
+        total: Number of records in the collection
+        
+    Returns:
+        The records of the page
+    """
+    return [{"id": i, "name": f"User {i}"} for i in range(offset, min(offset + limit, total))]
+
+def simulated_response(endpoint):
+    """
+    Build the canned response of the simulated API.
+    
+    Args:
+        endpoint: The API endpoint URL or path
+        
+    Returns:
+        Simulated API response data
+    """
+    if "users" in endpoint:
+        return [
+            {"id": 1, "name": "John Doe"},
+            {"id": 2, "name": "Jane Smith"}
+        ]
+    return [{"error": "Unknown endpoint"}]
+
+def estimate_size(data, sample=ESTIMATE_SAMPLE_SIZE):
+    """
+    Estimate the memory used by parsed data (nested lists, dicts and scalars).
+    
+    Lists and tuples longer than `sample` are measured from evenly spaced
+    elements and extrapolated, so large datasets are sized in a fraction of
+    the time it took to parse them.
+    
+    Args:
+        data: The data to measure
+        sample: Number of elements measured in long lists and tuples
+        
+    Returns:
+        The approximate size in bytes
+    """
+    size = 0.0
+    stack = [(data, 1.0)]
+    while stack:
+        item, weight = stack.pop()
+        size += sys.getsizeof(item) * weight
+        if isinstance(item, dict):
+            stack.extend((key, weight) for key in item.keys())
+            stack.extend((value, weight) for value in item.values())
+        elif isinstance(item, (list, tuple)):
+            if len(item) > sample:
+                step = len(item) / sample
+                weight *= step
+                stack.extend((item[int(i * step)], weight) for i in range(sample))
+            else:
+                stack.extend((element, weight) for element in item)
+    return int(size)
+
+class DataCache:
+    """
+    A thread-safe LRU cache of fetched data, shared by CachedDataSource wrappers.
+    Each entry carries a validator and an optional expiry time, and the total
+    size of the entries can be capped. Concurrent misses on the same entry can
+    be answered by a single fetch (see get_or_claim()).
+    """
+    
+    def __init__(self, max_bytes=None):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_bytes: Optional cap on the total size of the cached entries;
+                least recently used entries are evicted to stay under it
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Fetches in flight: (key, validator) -> Future of the fetched data
+        self._fetches = {}
+        self._lock = threading.Lock()
+    
+    def _find(self, key, validator):
+        # Return (True, data) for a fresh entry, marking it recently used, or (False, None)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry_validator, expires, data, _ = entry
+            if entry_validator == validator and (expires is None or time.monotonic() < expires):
+                self._entries.move_to_end(key)
+                return True, data
+        return False, None
+    
+    def get(self, key, validator=None):
+        """
+        Look up a fresh entry.
+        
+        Args:
+            key: The cache key
+            validator: The value the entry's validator must equal, e.g. a file's (mtime_ns, size)
+            
+        Returns:
+            A (found, data) tuple
+        """
+        with self._lock:
+            found, data = self._find(key, validator)
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return found, data
+    
+    def get_or_claim(self, key, validator=None):
+        """
+        Look up a fresh entry, or find out who fetches it on a miss.
+        
+        Concurrent misses on the same key and validator are answered by a single
+        fetch: the first caller to miss claims the fetch and must call release()
+        when it ends, and callers that miss while it runs get a Future of its
+        data instead. Callers answered by another caller's fetch count as hits.
+        
+        Args:
+            key: The cache key
+            validator: The value the entry's validator must equal
+            
+        Returns:
+            A (found, data, pending) tuple: found and data as returned by get(), and
+            on a miss the Future of the fetch in flight, or None if the caller claimed it
+        """
+        with self._lock:
+            found, data = self._find(key, validator)
+            pending = None if found else self._fetches.get((key, validator))
+            if found or pending is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._fetches[(key, validator)] = Future()
+            return found, data, pending
+    
+    def release(self, key, validator=None, data=_ABANDONED, error=None):
+        """
+        End a fetch claimed with get_or_claim() and hand its outcome to the callers waiting for it.
+        
+        Args:
+            key: The cache key
+            validator: The validator passed to get_or_claim()
+            data: The fetched data, if the fetch succeeded
+            error: The exception the fetch raised, if it failed; it is raised to the
+                waiting callers too. Without data or an error the fetch was abandoned,
+                and the waiting callers fetch again.
+        """
+        with self._lock:
+            future = self._fetches.pop((key, validator))
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(data)
+    
+    def put(self, key, data, size, validator=None, ttl=None):
+        """
+        Store an entry, replacing any older entry for the same key.
+        
+        Args:
+            key: The cache key
+            data: The data to cache
+            size: The size of the data in bytes, counted against max_bytes
+            validator: Value that must match for the entry to be used
+            ttl: Optional number of seconds the entry stays fresh
+        """
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (validator, expires, data, size)
+            self.total_bytes += size
+            while self.max_bytes is not None and self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+    
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[3]
+    
+    def discard(self, key):
+        """
+        Remove the entry for a key, if there is one.
+        
+        Args:
+            key: The cache key
+        """
+        with self._lock:
+            self._remove(key)
+    
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+class CachedDataSource(DataSource):
+    """
+    Wraps another DataSource and caches what it fetches.
+    
+    File sources are re-read only when their (mtime_ns, size) changes, at the
+    cost of one os.stat() per fetch. Other sources are re-fetched once their
+    cached data is older than the TTL. Cached data is returned as is, so
+    callers must not modify it. Entries are charged the estimated in-memory
+    size of their data (see estimate_size()) against the cache's max_bytes.
+    """
+    
+    def __init__(self, source, cache=None, ttl=DEFAULT_CACHE_TTL):
+        """
+        Initialize a caching wrapper.
+        
+        Args:
+            source: The DataSource to cache
+            cache: Optional DataCache to share between wrappers; a private one is used otherwise
+            ttl: Seconds cached data of a non-file source stays fresh
+        """
+        self.source = source
+        self.cache = cache if cache is not None else DataCache()
+        self.ttl = ttl
+        self._key = None
+        if not isinstance(source, FileDataSource):
+            if hasattr(source, 'endpoint'):
+                self._key = ('source', source.endpoint)
+            else:
+                try:
+                    # Keyed by identity, so drop the entry when the source goes away
+                    # before another object can be created with the same id()
+                    weakref.finalize(source, self.cache.discard, ('source', id(source)))
+                    self._key = ('source', id(source))
+                except TypeError:
+                    # The source can't be weakly referenced (e.g. __slots__ without
+                    # __weakref__), so don't share its entry: key it by a token only this
+                    # wrapper holds, which the entry keeps alive, and drop it with the wrapper
+                    self._key = ('source', object())
+                    weakref.finalize(self, self.cache.discard, self._key)
+    
+    def _lookup(self):
+        """
+        Work out the key and validator of the wrapped source and look them up,
+        claiming the fetch on a miss unless another caller is already fetching.
+        
+        Returns:
+            A (found, data, pending, key, validator) tuple (see DataCache.get_or_claim())
+        """
+        if isinstance(self.source, FileDataSource):
+            st = os.stat(self.source.file_path)
+            key = ('file', os.path.abspath(self.source.file_path))
+            validator = (st.st_mtime_ns, st.st_size)
+        else:
+            key = self._key
+            validator = None
+        found, data, pending = self.cache.get_or_claim(key, validator)
+        return found, data, pending, key, validator
+    
+    def _store(self, key, validator, data):
+        # Parsed data takes several times the size of the file it came from, so charge the estimate
+        if validator is not None:
+            self.cache.put(key, data, estimate_size(data), validator)
+        else:
+            self.cache.put(key, data, estimate_size(data), ttl=self.ttl)
+    
+    def _release(self, key, validator, error):
+        # Hand a failed fetch to the callers waiting for it; cancellation and other
+        # BaseExceptions belong to this caller only, so they fetch again instead
+        if isinstance(error, Exception):
+            self.cache.release(key, validator, error=error)
+        else:
+            self.cache.release(key, validator)
+    
+    def fetch_data(self):
+        """
+        Return the cached data if it is still valid, otherwise fetch and cache it.
+        Callers that miss while another caller fetches the same data wait for that fetch.
+        
+        Returns:
+            The fetched data (format depends on the wrapped source)
+        """
+        while True:
+            found, data, pending, key, validator = self._lookup()
+            if found:
+                return data
+            if pending is None:
+                break
+            data = pending.result()
+            if data is not _ABANDONED:
+                return data
+        try:
+            data = self.source.fetch_data()
+            self._store(key, validator, data)
+        except BaseException as e:
+            self._release(key, validator, e)
+            raise
+        self.cache.release(key, validator, data)
+        return data
+    
+    async def afetch_data(self):
+        """
+        Like fetch_data(), but fetches through the wrapped source's afetch_data() on a miss.
+        Cache hits are answered directly, without a trip through the thread pool.
+        
+        Returns:
+            The fetched data (format depends on the wrapped source)
+        """
+        while True:
+            found, data, pending, key, validator = self._lookup()
+            if found:
+                return data
+            if pending is None:
+                break
+            # Shielded so that a waiter timing out doesn't cancel the fetch for the others
+            data = await asyncio.shield(asyncio.wrap_future(pending))
+            if data is not _ABANDONED:
+                return data
+        try:
+            data = await self.source.afetch_data()
+            self._store(key, validator, data)
+        except BaseException as e:
+            self._release(key, validator, e)
+            raise
+        self.cache.release(key, validator, data)
+        return data
+
+class FetchResult:
+    """
+    The outcome of fetching one source with fetch_many(): either its data or the error it raised.
+    """
+    
+    def __init__(self, source, data=None, error=None, elapsed=0.0):
+        """
+        Initialize a fetch result.
+        
+        Args:
+            source: The DataSource that was fetched
+            data: The fetched data, if the fetch succeeded
+            error: The exception raised, if the fetch failed (asyncio.TimeoutError on timeout)
+            elapsed: Time taken by the fetch in seconds
+        """
+        self.source = source
+        self.data = data
+        self.error = error
+        self.elapsed = elapsed
+    
+    @property
+    def ok(self):
+        """
+        Whether the fetch succeeded.
+        """
+        return self.error is None
+    
+    def __repr__(self):
+        outcome = 'ok' if self.ok else f'error={self.error!r}'
+        return f"FetchResult({type(self.source).__name__}, {outcome}, {self.elapsed:.3f}s)"
+
+async def afetch_many(sources, concurrency=DEFAULT_CONCURRENCY, timeout=None):
+    """
+    Fetch many data sources concurrently.
+    
+    At most `concurrency` sources are fetched at the same time. Blocking fetches
+    run in a thread pool of `concurrency` workers owned by this call, so the
+    limit isn't capped by the size of the event loop's default pool. A source
+    that fails or exceeds its timeout is reported in its result instead of
+    failing the whole batch.
+    
+    A timed-out fetch running in a thread can't be interrupted, so it is
+    abandoned: this function returns without waiting for it, but the thread
+    runs on until the fetch ends (API sources are bounded by their pool's
+    socket timeout), and the interpreter waits for it before exiting.
+    
+    Args:
+        sources: The DataSources to fetch
+        concurrency: Maximum number of fetches in flight
+        timeout: Optional per-source timeout in seconds
+        
+    Returns:
+        A list of FetchResult, in the same order as the sources
+    """
+    limit = asyncio.Semaphore(concurrency)
+    
+    async def fetch_one(source):
+        async with limit:
+            start = time.perf_counter()
+            try:
+                data = await asyncio.wait_for(source.afetch_data(), timeout)
+            except Exception as e:
+                return FetchResult(source, error=e, elapsed=time.perf_counter() - start)
+            return FetchResult(source, data, elapsed=time.perf_counter() - start)
+    
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    token = _fetch_executor.set(executor)
+    try:
+        # The fetch tasks copy the current context, and with it the executor
+        return await asyncio.gather(*(fetch_one(source) for source in sources))
+    finally:
+        _fetch_executor.reset(token)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_many(sources, concurrency=DEFAULT_CONCURRENCY, timeout=None):
+    """
+    Fetch many data sources concurrently from synchronous code.
+    Runs afetch_many() in a new event loop; like afetch_many() it returns as soon
+    as every source has finished or timed out.
+    
+    Args:
+        sources: The DataSources to fetch
+        concurrency: Maximum number of fetches in flight
+        timeout: Optional per-source timeout in seconds
+        
+    Returns:
+        A list of FetchResult, in the same order as the sources
+    """
+    return asyncio.run(afetch_many(sources, concurrency, timeout))
+
+class StubAPIServer:
+    """
+    A local HTTP server serving the simulated API responses, standing in for a real endpoint.
+    It supports keep-alive connections and can add latency to every response.
+    Requests with offset or cursor parameters are answered with pages of a
+    generated collection, as described in APIDataSource.
+    """
+    
+    def __init__(self, delay=0.0, records=1000, host='127.0.0.1', port=0):
+        """
+        Initialize the server; it starts listening when started or entered as a context manager.
+        
+        Args:
+            delay: Seconds to wait before answering each request
+            records: Number of records in the paginated collection
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        self.delay = delay
+        self.records = records
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections open between requests; without Nagle's
+            # algorithm the separately written headers and body aren't delayed
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                if server.delay:
+                    time.sleep(server.delay)
+                query = parse_qs(urlsplit(self.path).query)
+                limit = int(query.get('limit', ['100'])[0])
+                if 'offset' in query:
+                    response = stub_records(int(query['offset'][0]), limit, server.records)
+                elif 'cursor' in query or 'limit' in query:
+                    offset = int(query.get('cursor', ['0'])[0])
+                    next_offset = offset + limit
+                    response = {"records": stub_records(offset, limit, server.records),
+                                "next_cursor": str(next_offset) if next_offset < server.records else None}
+                else:
+                    response = simulated_response(self.path)
+                body = json.dumps(response).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self):
+        """
+        The base URL of the server, e.g. 'http://127.0.0.1:54321'.
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """
+        Start serving requests in a background thread.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """
+        Stop the server and close its socket.
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
 
 # Test the implementation
 if __name__ == "__main__":
@@ -94,8 +931,34 @@ if __name__ == "__main__":
     api_source = APIDataSource("https://api.example.com/users")
     print(api_source.fetch_data())
     
+    # Test fetching many sources concurrently from a local stub API server
+    print("\nTesting fetch_many:")
+    with StubAPIServer(delay=0.01) as server:
+        pool = ConnectionPool()
+        sources = [APIDataSource(f"{server.url}/users/{i}", pool) for i in range(3)]
+        sources.append(FileDataSource("missing.json"))
+        for result in fetch_many(sources, concurrency=10, timeout=5):
+            print(result.data if result.ok else f"Failed: {result.error!r}")
+        pool.close()
+    
+    # Test streaming records in batches
+    print("\nTesting iter_records:")
+    for batch in file_source.iter_records(batch_size=1):
+        print(batch)
+    with StubAPIServer(records=5) as server:
+        pool = ConnectionPool()
+        for batch in APIDataSource(f"{server.url}/users", pool, pagination='cursor').iter_records(batch_size=2):
+            print(batch)
+        pool.close()
+    
+    # Test caching: the second fetch is answered from the cache
+    print("\nTesting CachedDataSource:")
+    cached_source = CachedDataSource(FileDataSource("sample_data.json"))
+    cached_source.fetch_data()
+    print(cached_source.fetch_data())
+    print(f"Cache hits: {cached_source.cache.hits}, misses: {cached_source.cache.misses}")
+    
     # Clean up test file
-    import os
     os.remove("sample_data.json")
     
     # Example output:
@@ -103,4 +966,21 @@ if __name__ == "__main__":
     # [{'id': 1, 'name': 'Test Item 1'}, {'id': 2, 'name': 'Test Item 2'}]
     #
     # Testing APIDataSource:
-    # [{'id': 1, 'name': 'John Doe'}, {'id': 2, 'name': 'Jane Smith'}] 
\ No newline at end of file
+    # [{'id': 1, 'name': 'John Doe'}, {'id': 2, 'name': 'Jane Smith'}]
+    #
+    # Testing fetch_many:
+    # [{'id': 1, 'name': 'John Doe'}, {'id': 2, 'name': 'Jane Smith'}]
+    # [{'id': 1, 'name': 'John Doe'}, {'id': 2, 'name': 'Jane Smith'}]
+    # [{'id': 1, 'name': 'John Doe'}, {'id': 2, 'name': 'Jane Smith'}]
+    # Failed: FileNotFoundError(2, 'No such file or directory')
+    #
+    # Testing iter_records:
+    # [{'id': 1, 'name': 'Test Item 1'}]
+    # [{'id': 2, 'name': 'Test Item 2'}]
+    # [{'id': 0, 'name': 'User 0'}, {'id': 1, 'name': 'User 1'}]
+    # [{'id': 2, 'name': 'User 2'}, {'id': 3, 'name': 'User 3'}]
+    # [{'id': 4, 'name': 'User 4'}]
+    #
+    # Testing CachedDataSource:
+    # [{'id': 1, 'name': 'Test Item 1'}, {'id': 2, 'name': 'Test Item 2'}]
+    # Cache hits: 1, misses: 1 
\ No newline at end of file
@@ -1,6 +1,13 @@
 # Import Protocol from typing module
 # Protocol is used for structural typing (duck typing with type hints)
-from typing import Protocol
+from typing import Iterable, Optional, Protocol, TextIO
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+import sys
+
+# Number of items rendered into one buffer before it is written out
+DEFAULT_CHUNK_SIZE = 2000
 
 class Printable(Protocol):
     """
@@ -75,6 +82,69 @@ def print_item(item: Printable) -> None:
     """
     print(item.to_string())
 
+def render_items(items: Iterable[Printable]) -> str:
+    """
+    Render items into a single string, one item per line.
+    
+    Args:
+        items: Objects that conform to the Printable protocol
+    
+    Returns:
+        The rendered lines, each ending with a newline
+    """
+    lines = [item.to_string() for item in items]
+    lines.append('')
+    return '\n'.join(lines)
+
+def print_items(items: Iterable[Printable], out: Optional[TextIO] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 0, processes: bool = False) -> int:
+    """
+    Print many Printable objects, one per line, much faster than calling print_item() on each.
+    Items are rendered chunk_size at a time into one buffer, which is written with a single call.
+    For very large catalogs, chunks can be rendered by a pool of worker threads or processes;
+    output order is preserved. Process workers need the items to be picklable.
+    
+    Args:
+        items: Objects that conform to the Printable protocol
+        out: Text stream to write to (default: sys.stdout)
+        chunk_size: Number of items rendered per write
+        workers: Number of worker threads or processes; 0 renders in the calling thread
+        processes: Use worker processes instead of threads
+    
+    Returns:
+        The number of items printed
+    
+    Raises:
+        ValueError: If chunk_size is less than 1 or workers is negative
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    if workers < 0:
+        raise ValueError("Number of workers must not be negative")
+    out = sys.stdout if out is None else out
+    iterator = iter(items)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    count = 0
+    
+    if not workers:
+        for chunk in chunks:
+            out.write(render_items(chunk))
+            count += len(chunk)
+    else:
+        executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            # Keep a bounded number of chunks in flight so a huge iterable isn't read all at once
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(render_items, chunk))
+                count += len(chunk)
+                if len(pending) >= 2 * workers:
+                    out.write(pending.popleft().result())
+            while pending:
+                out.write(pending.popleft().result())
+    out.flush()
+    return count
+
 # Test the implementation
 if __name__ == "__main__":
     # Test Book
@@ -85,6 +155,11 @@ if __name__ == "__main__":
     movie = Movie("The Godfather", "Francis Ford Coppola")
     print_item(movie)
     
+    # Test printing a whole catalog at once
+    print_items([book, movie])
+    
     # Example output:
     # Book: The Great Gatsby by F. Scott Fitzgerald
     # Movie: The Godfather directed by Francis Ford Coppola
+    # Book: The Great Gatsby by F. Scott Fitzgerald
+    # Movie: The Godfather directed by Francis Ford Coppola
@@ -1,23 +1,27 @@
 # Import Protocol from typing module
 # Protocol is used for structural typing (duck typing with type hints)
-from typing import Protocol
+from typing import Protocol, TypeVar
 
-class DataProcessor(Protocol):
+# Type of the items a processor works on (integers in the examples below,
+# rows of a data file in q9_data_importer_cli)
+T = TypeVar('T')
+
+class DataProcessor(Protocol[T]):
     """
     A Protocol that defines the interface for data processors.
-    Any class that has a process() method taking a list of integers and returning a list of integers
-    conforms to this protocol, even without explicitly inheriting from it.
+    Any class that has a process() method taking a list of items (integers in the examples below)
+    and returning a list of items conforms to this protocol, even without explicitly inheriting from it.
     """
-    def process(self, data: list[int]) -> list[int]:
+    def process(self, data: list[T]) -> list[T]:
         """
-        Process a list of integers and return a new processed list.
+        Process a list of items and return a new processed list.
         This is the only method required to conform to the DataProcessor protocol.
         
         Args:
-            data: List of integers to process
+            data: List of items to process
             
         Returns:
-            Processed list of integers
+            Processed list of items
         """
         pass
 
@@ -59,17 +63,17 @@ class SquareProcessor:
         """
         return [x * x for x in data]
 
-def apply_processor(processor: DataProcessor, input_data: list[int]) -> list[int]:
+def apply_processor(processor: DataProcessor[T], input_data: list[T]) -> list[T]:
     """
     Apply a data processor to the input data.
     This function demonstrates how to use the protocol for type hints.
     
     Args:
         processor: Any object that has a process() method
-        input_data: List of integers to process
+        input_data: List of items to process
         
     Returns:
-        Processed list of integers
+        Processed list of items
     """
     return processor.process(input_data)
 
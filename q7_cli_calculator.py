@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 # Import argparse for command-line argument parsing
 import argparse
+import sys
+
+from profile_hooks import add_profile_arguments, profile_mode, profiled
 
 def main():
     """
@@ -18,20 +21,30 @@ def main():
     parser.add_argument('num2', type=float, help='Second number')
     parser.add_argument('operation', choices=['add', 'subtract', 'multiply'],
                        help='Operation to perform (add, subtract, multiply)')
+    # profile, profile-output: Optional cProfile/tracemalloc report of the run
+    add_profile_arguments(parser)
     
     # Parse the command-line arguments
     args = parser.parse_args()
     
-    # Perform the requested operation
-    if args.operation == 'add':
-        result = args.num1 + args.num2
-    elif args.operation == 'subtract':
-        result = args.num1 - args.num2
-    else:  # multiply
-        result = args.num1 * args.num2
+    # Check the profile mode ($Q_PROFILE may be set to anything) before doing any work
+    try:
+        profile = profile_mode(args.profile)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     
-    # Print the result
-    print(f"Result: {result}")
+    with profiled(profile, args.profile_output):
+        # Perform the requested operation
+        if args.operation == 'add':
+            result = args.num1 + args.num2
+        elif args.operation == 'subtract':
+            result = args.num1 - args.num2
+        else:  # multiply
+            result = args.num1 * args.num2
+        
+        # Print the result
+        print(f"Result: {result}")
 
 if __name__ == '__main__':
     main()
@@ -46,9 +59,15 @@ if __name__ == '__main__':
 # python q7_cli_calculator.py 6 7 multiply
 # Result: 42.0
 #
+# python q7_cli_calculator.py 6 7 multiply --profile cprofile
+# Result: 42.0
+# [Followed by a cProfile report on stderr; Q_PROFILE=cprofile does the same]
+#
 # To see help message:
 # python q7_cli_calculator.py --help
-# usage: q7_cli_calculator.py [-h] num1 num2 {add,subtract,multiply}
+# usage: q7_cli_calculator.py [-h] [--profile {cprofile,tracemalloc}]
+#                             [--profile-output PROFILE_OUTPUT]
+#                             num1 num2 {add,subtract,multiply}
 #
 # Simple command-line calculator
 #
@@ -58,4 +77,10 @@ if __name__ == '__main__':
 #   operation            Operation to perform (add, subtract, multiply)
 #
 # optional arguments:
-#   -h, --help           show this help message and exit 
\ No newline at end of file
+#   -h, --help           show this help message and exit
+#   --profile {cprofile,tracemalloc}
+#                         Profile the run with cProfile or tracemalloc and
+#                         report to stderr (default: $Q_PROFILE, if set)
+#   --profile-output PROFILE_OUTPUT
+#                         Also save the raw profile to this file (default:
+#                         $Q_PROFILE_OUTPUT, if set) 
\ No newline at end of file
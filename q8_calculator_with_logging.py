@@ -2,8 +2,11 @@
 # Import required modules
 import argparse
 import logging
+import sys
 from datetime import datetime
 
+from profile_hooks import add_profile_arguments, profile_mode, profiled
+
 # Configure logging
 # Set up logging to write to a file with timestamp in the name
 # Format: calculator_YYYY-MM-DD.log
@@ -64,15 +67,25 @@ def main():
     parser.add_argument('num2', type=float, help='Second number')
     parser.add_argument('operation', choices=['add', 'subtract', 'multiply'],
                        help='Operation to perform (add, subtract, multiply)')
+    # profile, profile-output: Optional cProfile/tracemalloc report of the run
+    add_profile_arguments(parser)
     
     # Parse the command-line arguments
     args = parser.parse_args()
     
+    # Check the profile mode ($Q_PROFILE may be set to anything) before doing any work
     try:
-        # Perform the calculation and get the result
-        result = calculate(args.num1, args.num2, args.operation)
-        # Print the result
-        print(f"Result: {result}")
+        profile = profile_mode(args.profile)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    try:
+        with profiled(profile, args.profile_output):
+            # Perform the calculation and get the result
+            result = calculate(args.num1, args.num2, args.operation)
+            # Print the result
+            print(f"Result: {result}")
     except ValueError as e:
         # Log and print any errors that occur
         logging.error(str(e))
@@ -94,6 +107,10 @@ if __name__ == '__main__':
 # Result: 42.0
 # (Logs to calculator_YYYY-MM-DD.log)
 #
+# python q8_calculator_with_logging.py 6 7 multiply --profile cprofile
+# Result: 42.0
+# (Followed by a cProfile report on stderr; Q_PROFILE=cprofile does the same)
+#
 # Example log file contents (calculator_YYYY-MM-DD.log):
 # 2024-02-14 10:30:15,123 - INFO - Starting calculation: 5 add 3
 # 2024-02-14 10:30:15,124 - INFO - Calculation result: 8.0
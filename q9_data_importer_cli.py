@@ -1,10 +1,74 @@
 #!/usr/bin/env python3
 # Import required modules
 import argparse
+import array
+import hashlib
+import inspect
+import itertools
 import json
 import csv
+import marshal
+import mmap
+import operator
+import os
+import pickle
+import re
+import struct
 import sys
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Callable, Iterator, Optional, Sequence, TextIO, Tuple, Union
+
+from profile_hooks import add_profile_arguments, profile_mode, profiled
+from q6_data_processor_protocol import DataProcessor, apply_processor
+
+# Number of rows written between checkpoints
+DEFAULT_BATCH_SIZE = 10000
+# Suffix of the sidecar file that records the progress of an import
+CHECKPOINT_SUFFIX = '.checkpoint'
+# Name of the manifest file that remembers which files were already imported
+MANIFEST_NAME = '.import_manifest.json'
+# Number of leading bytes hashed to recognise a file that was already imported
+HEAD_HASH_BYTES = 64 * 1024
+# Number of CSV rows sampled to infer the type of each column
+SCHEMA_SAMPLE_ROWS = 1000
+# Column types understood by typed CSV reading
+COLUMN_TYPES = ('int', 'float', 'bool', 'null', 'str')
+
+# Patterns used when inferring column types. Integers with leading zeros
+# (zip codes, zero-padded IDs) are deliberately left as strings.
+_INT_PATTERN = re.compile(r'[-+]?(0|[1-9][0-9]*)')
+_FLOAT_PATTERN = re.compile(r'[-+]?((0|[1-9][0-9]*)(\.[0-9]*)?|\.[0-9]+)([eE][-+]?[0-9]+)?')
+# Characters int and float values matching the patterns above are made of, and a
+# leading zero followed by another digit, for checking a whole column at once
+_NUMBER_CHARS = {'int': b'0123456789+-\n', 'float': b'0123456789.eE+-\n'}
+_LEADING_ZERO_PATTERN = re.compile(r'\n[-+]?0[0-9]')
+# Numbers accepted in columns typed by an explicit schema, which may have leading zeros
+_SCHEMA_NUMBER_PATTERNS = {'int': re.compile(r'[-+]?[0-9]+'),
+                           'float': re.compile(r'[-+]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][-+]?[0-9]+)?')}
+_BOOL_VALUES = {'true': True, 'false': False}
+
+# Pattern and comparison operators of --where predicates such as 'age>=30'
+_PREDICATE_PATTERN = re.compile(r'\s*(.+?)\s*(==|!=|>=|<=|=|>|<)\s*(.*?)\s*')
+_OPERATOR_CHARS = '=!<>'
+_OPERATORS = {'==': operator.eq, '=': operator.eq, '!=': operator.ne,
+              '>=': operator.ge, '<=': operator.le, '>': operator.gt, '<': operator.lt}
+
+# Output formats: text formats are written to text streams, binary formats to byte streams
+TEXT_FORMATS = ('json', 'csv', 'jsonl')
+BINARY_FORMATS = ('pickle', 'marshal', 'columnar')
+OUTPUT_FORMATS = TEXT_FORMATS + BINARY_FORMATS
+
+# Magic bytes at the start of the binary formats
+_RECORD_STREAM_MAGIC = {'pickle': b'Q9PICKL1', 'marshal': b'Q9MARSH1'}
+_COLUMNAR_MAGIC = b'Q9COLS1'
+# Length prefix of a record stream frame, and headers of a columnar block and column
+_FRAME_HEADER = struct.Struct('<I')
+_BLOCK_HEADER = struct.Struct('<II')
+_COLUMN_HEADER = struct.Struct('<HccQ')
+# Column types of the columnar format: int64, float64 and bool arrays ('q', 'd', '?'),
+# strings ('s'), all-null columns ('n') and pickled columns of mixed types ('p')
+_ARRAY_TYPES = ('q', 'd', '?')
+# Codes of a column's null mask: a null value, a value, and a row without the column's key
+_MASK_NULL, _MASK_PRESENT, _MASK_ABSENT = 0, 1, 2
 
 def read_json_file(file_path: str) -> List[Dict[str, Any]]:
     """
@@ -30,13 +94,15 @@ def read_json_file(file_path: str) -> List[Dict[str, Any]]:
         print(f"Error: '{file_path}' contains invalid JSON")
         sys.exit(1)
 
-def read_csv_file(file_path: str) -> List[Dict[str, Any]]:
+def read_csv_file(file_path: str, schema: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
     """
     Read and parse a CSV file into a list of dictionaries.
     Each row becomes a dictionary with column headers as keys.
     
     Args:
         file_path: Path to the CSV file
+        schema: Optional column types for typed reading (see build_converters());
+            an empty dict infers every column. Without it every value is a string.
     
     Returns:
         List[Dict[str, Any]]: List of dictionaries from the CSV file
@@ -44,6 +110,15 @@ def read_csv_file(file_path: str) -> List[Dict[str, Any]]:
     Raises:
         FileNotFoundError: If the file doesn't exist
     """
+    if schema is not None:
+        fieldnames, offset = read_csv_header(file_path)
+        if fieldnames is None:
+            return []
+        converters = build_converters(file_path, fieldnames, schema)
+        data = []
+        for rows, _ in iter_csv_batches(file_path, fieldnames, offset, converters=converters):
+            data.extend(rows)
+        return data
     try:
         with open(file_path, 'r') as f:
             # Use DictReader to automatically create dictionaries from CSV rows
@@ -52,17 +127,1036 @@ def read_csv_file(file_path: str) -> List[Dict[str, Any]]:
         print(f"Error: File '{file_path}' not found")
         sys.exit(1)
 
+def _read_lines(f, position: List[int], complete_lines: bool = False) -> Iterator[str]:
+    """
+    Yield decoded lines from a binary file, keeping track of the byte offset.
+    
+    The csv module only pulls another line when it needs one, so after each
+    parsed row position[0] is the byte offset just past that row.
+    
+    A row the csv module returns after this generator finished was ended by
+    the end of the file rather than by a newline (see _ended_by_eof()).
+    
+    Args:
+        f: File opened in binary mode, positioned at position[0]
+        position: Single-element list updated with the current byte offset
+        complete_lines: Stop before a last line that has no newline yet, because
+            a file that is still being appended to may continue it
+    """
+    for line in iter(f.readline, b''):
+        if complete_lines and not line.endswith(b'\n'):
+            return
+        position[0] += len(line)
+        yield line.decode('utf-8')
+
+def _ended_by_eof(lines: Iterator[str]) -> bool:
+    """
+    Tell whether the line generator feeding a csv.reader ran out.
+    
+    The csv module returns a row as soon as a line ends it, without reading
+    ahead, so a row returned once the lines ran out was cut off by the end of
+    the input: with complete lines, a quoted field that is still open.
+    
+    Args:
+        lines: Generator from _read_lines()
+    """
+    return inspect.getgeneratorstate(lines) == inspect.GEN_CLOSED
+
+def read_csv_header(file_path: str, complete_lines: bool = False) -> Tuple[Optional[List[str]], int]:
+    """
+    Read the header row of a CSV file.
+    
+    Args:
+        file_path: Path to the CSV file
+        complete_lines: Treat a header that isn't complete yet as missing (see _read_lines())
+    
+    Returns:
+        Tuple[Optional[List[str]], int]: The column names (None for an empty file)
+        and the byte offset where the first data row starts
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            position = [0]
+            lines = _read_lines(f, position, complete_lines)
+            header = next(csv.reader(lines), None)
+            if complete_lines and _ended_by_eof(lines):
+                return None, 0
+            return header, position[0]
+    except FileNotFoundError:
+        print(f"Error: File '{file_path}' not found")
+        sys.exit(1)
+
+def _parse_bool(value: str) -> bool:
+    """
+    Parse 'true' or 'false' (in any letter case) into a bool.
+    
+    Raises:
+        ValueError: If the value is not a boolean literal
+    """
+    try:
+        return _BOOL_VALUES[value.lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value!r}")
+
+def _value_type(value: str) -> str:
+    """
+    Classify a single non-empty CSV value as 'bool', 'int', 'float' or 'str'.
+    """
+    if value.lower() in _BOOL_VALUES:
+        return 'bool'
+    if _INT_PATTERN.fullmatch(value):
+        return 'int'
+    if _FLOAT_PATTERN.fullmatch(value):
+        return 'float'
+    return 'str'
+
+def infer_schema(records: List[List[str]], fieldnames: List[str]) -> Dict[str, str]:
+    """
+    Infer the type of each column from a sample of raw CSV records.
+    
+    Empty values are treated as null. A column of only nulls is 'null',
+    a mix of ints and floats is 'float', and any other mix is 'str'.
+    
+    Args:
+        records: Sample of records as returned by csv.reader
+        fieldnames: Column names from the header row
+    
+    Returns:
+        Dict[str, str]: Mapping of column name to one of COLUMN_TYPES
+    """
+    schema = {}
+    for index, name in enumerate(fieldnames):
+        kinds = {_value_type(record[index]) for record in records
+                 if index < len(record) and record[index] != ''}
+        if not kinds:
+            schema[name] = 'null'
+        elif len(kinds) == 1:
+            schema[name] = kinds.pop()
+        elif kinds == {'int', 'float'}:
+            schema[name] = 'float'
+        else:
+            schema[name] = 'str'
+    return schema
+
+def parse_schema(text: str) -> Dict[str, str]:
+    """
+    Parse a --schema argument of the form 'name:type,name:type'.
+    
+    Args:
+        text: The schema specification
+    
+    Returns:
+        Dict[str, str]: Mapping of column name to type
+    
+    Raises:
+        ValueError: If an entry is malformed or names an unknown type
+    """
+    schema = {}
+    for entry in filter(None, text.split(',')):
+        name, sep, type_name = entry.rpartition(':')
+        if not sep or type_name not in COLUMN_TYPES:
+            raise ValueError(f"Invalid schema entry '{entry}', expected name:{'|'.join(COLUMN_TYPES)}")
+        schema[name] = type_name
+    return schema
+
+def _make_column_converter(type_name: str, name: Optional[str] = None) -> Optional[Callable[[List[Any]], List[Any]]]:
+    """
+    Build a converter that turns a whole column of raw values into typed values.
+    
+    The common case of a column without empty or malformed values is converted
+    with a single map() over the built-in parser. Otherwise values are converted
+    one by one, and empty and missing values become None.
+    
+    For an inferred type, numbers are only converted when they match the patterns
+    schema inference uses, and values that don't parse are kept as strings: int()
+    and float() alone would also accept '007', '1_000', ' 1', 'nan' and 'inf', and
+    non-finite floats would make the JSON output invalid. A type given explicitly
+    is authoritative instead: numbers with leading zeros are converted ('007' is 7)
+    and any other value that doesn't parse fails the import, so the column never
+    mixes types.
+    
+    Args:
+        type_name: One of COLUMN_TYPES
+        name: Name of the column if its type was given explicitly, None if it was inferred
+    
+    Returns:
+        Optional[Callable[[List[Any]], List[Any]]]: The converter, or None for
+        'str' columns, which need no conversion
+    """
+    if type_name == 'str':
+        return None
+    if type_name == 'null':
+        return lambda values: [None if value == '' else value for value in values]
+    
+    parse = {'int': int, 'float': float, 'bool': _parse_bool}[type_name]
+    if name is None:
+        pattern = {'int': _INT_PATTERN, 'float': _FLOAT_PATTERN}.get(type_name)
+    else:
+        pattern = _SCHEMA_NUMBER_PATTERNS.get(type_name)
+    chars = _NUMBER_CHARS.get(type_name)
+    
+    def plain_numbers(values):
+        # Values that int()/float() accepted only match the patterns if they use no other
+        # characters (no spaces, '_', 'nan', 'inf' or non-ASCII digits), contain no
+        # newlines of their own and, for inferred types, have no leading zeros
+        text = '\n' + '\n'.join(values)
+        return (text.isascii() and not text.encode().translate(None, chars)
+                and text.count('\n') == len(values)
+                and (name is not None or not _LEADING_ZERO_PATTERN.search(text)))
+    
+    def convert_value(value):
+        if value is None or value == '':
+            return None
+        try:
+            if pattern is not None and not pattern.fullmatch(value):
+                raise ValueError(value)
+            return parse(value)
+        except ValueError:
+            if name is None:
+                return value
+            raise ValueError(f"Column '{name}' is typed {type_name} but has the value {value!r}")
+    
+    def convert(values):
+        try:
+            converted = list(map(parse, values))
+        except (ValueError, TypeError, AttributeError):
+            return [convert_value(value) for value in values]
+        if chars is None or plain_numbers(values):
+            return converted
+        return [convert_value(value) for value in values]
+    return convert
+
+def build_converters(file_path: str, fieldnames: List[str],
+                     schema: Dict[str, str]) -> List[Optional[Callable[[List[Any]], List[Any]]]]:
+    """
+    Build per-column converters for typed CSV reading.
+    
+    Columns missing from the schema have their type inferred from the first
+    SCHEMA_SAMPLE_ROWS rows of the file. Values of the columns the schema types
+    explicitly must all parse as that type (see _make_column_converter()).
+    
+    Args:
+        file_path: Path to the CSV file
+        fieldnames: Column names from the header row
+        schema: Explicit column types, possibly covering only some columns
+    
+    Returns:
+        List[Optional[Callable[[List[Any]], List[Any]]]]: One converter per column
+    
+    Raises:
+        ValueError: If the schema names a column that is not in the header
+    """
+    unknown = [name for name in schema if name not in fieldnames]
+    if unknown:
+        raise ValueError(f"Unknown column(s) in schema: {', '.join(unknown)}")
+    inferred = {}
+    if any(name not in schema for name in fieldnames):
+        with open(file_path, 'rb') as f:
+            reader = csv.reader(_read_lines(f, [0]))
+            next(reader, None)
+            sample = [record for _, record in zip(range(SCHEMA_SAMPLE_ROWS), reader) if record]
+        inferred = infer_schema(sample, fieldnames)
+    return [_make_column_converter(schema[name], name) if name in schema
+            else _make_column_converter(inferred[name]) for name in fieldnames]
+
+def _typed_rows(records: List[List[str]], fieldnames: List[str],
+                converters: List[Optional[Callable[[List[Any]], List[Any]]]]) -> List[Dict[str, Any]]:
+    """
+    Convert a batch of raw CSV records into typed dictionaries, column by column.
+    Short and long records are handled like csv.DictReader does.
+    """
+    width = len(fieldnames)
+    ragged = [i for i, record in enumerate(records) if len(record) != width]
+    if ragged:
+        # Pad short records with None and cut long ones; extras are restored below
+        extras = {i: records[i][width:] for i in ragged if len(records[i]) > width}
+        records = [record if len(record) == width else (record + [None] * width)[:width]
+                   for record in records]
+    
+    columns = [column if convert is None else convert(column)
+               for column, convert in zip(zip(*records), converters)]
+    rows = [dict(zip(fieldnames, values)) for values in zip(*columns)]
+    
+    if ragged:
+        for i, values in extras.items():
+            rows[i][None] = values
+    return rows
+
+def _to_number(value: str):
+    """
+    Parse a string as an int if possible, otherwise as a float.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+def compile_predicate(text: str) -> Tuple[str, Callable[[Any], bool]]:
+    """
+    Compile a --where predicate such as 'age>=30' or 'name==John'.
+    
+    The literal decides how values are compared: numeric literals compare
+    numerically, 'true'/'false' compare as booleans and anything else compares
+    as a string. Values that are missing or can't be parsed never match.
+    
+    Args:
+        text: The predicate, as column, operator (==, =, !=, >=, <=, >, <) and literal
+    
+    Returns:
+        Tuple[str, Callable[[Any], bool]]: The column name and a test for its values
+    
+    Raises:
+        ValueError: If the predicate is malformed, including a column or literal that
+            starts or ends with an operator character (typos such as 'age=>30')
+    """
+    match = _PREDICATE_PATTERN.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Invalid predicate '{text}', expected e.g. 'age>=30'")
+    name, op, literal = match.groups()
+    if name[-1] in _OPERATOR_CHARS or (literal and literal[0] in _OPERATOR_CHARS):
+        raise ValueError(f"Invalid predicate '{text}', unknown operator (use == != >= <= > <)")
+    compare = _OPERATORS[op]
+    kind = _value_type(literal) if literal else 'str'
+    
+    if kind in ('int', 'float'):
+        target = _to_number(literal)
+        parse = _to_number
+    elif kind == 'bool':
+        target = _parse_bool(literal)
+        parse = _parse_bool
+    else:
+        target = literal
+        parse = str
+    
+    def test(value: Any) -> bool:
+        # CSV values are raw strings; JSON values are already typed
+        try:
+            return compare(parse(value) if isinstance(value, str) else value, target)
+        except (ValueError, TypeError):
+            return False
+    return name, test
+
+class RowFilter:
+    """
+    Keeps the rows for which every predicate matches.
+    Works on raw CSV records (keyed by column index) and on JSON rows (keyed by name).
+    This class conforms to the DataProcessor protocol from q6_data_processor_protocol.
+    """
+    
+    def __init__(self, predicates: List[Tuple[Any, Callable[[Any], bool]]]):
+        """
+        Initialize a filter from compiled predicates.
+        
+        Args:
+            predicates: Pairs of (column index or name, test) from compile_predicate()
+        """
+        self.predicates = predicates
+    
+    def process(self, data: List[Any]) -> List[Any]:
+        """
+        Filter the rows, one predicate at a time.
+        
+        Args:
+            data: Rows to filter
+        
+        Returns:
+            The rows matching every predicate
+        """
+        for key, test in self.predicates:
+            try:
+                data = [row for row in data if test(row[key])]
+            except (IndexError, KeyError):
+                # Short CSV records or JSON rows without the column never match
+                data = [row for row in data
+                        if (key in row if isinstance(row, dict) else key < len(row)) and test(row[key])]
+        return data
+
+class ColumnProjection:
+    """
+    Keeps only the selected columns of raw CSV records, before they are converted or turned into dicts.
+    This class conforms to the DataProcessor protocol from q6_data_processor_protocol for
+    records typed as Sequence[Any]: it takes the lists csv.reader produces and returns tuples.
+    """
+    
+    def __init__(self, indexes: List[int]):
+        """
+        Initialize a projection.
+        
+        Args:
+            indexes: Indexes of the columns to keep, in output order
+        """
+        self.indexes = indexes
+        self._get = operator.itemgetter(*indexes)
+    
+    def process(self, data: List[Sequence[Any]]) -> List[Sequence[Any]]:
+        """
+        Project each record onto the selected columns.
+        
+        Args:
+            data: Raw CSV records
+        
+        Returns:
+            The projected records; missing values in short records become None
+        """
+        try:
+            if len(self.indexes) == 1:
+                return [(value,) for value in map(self._get, data)]
+            return list(map(self._get, data))
+        except IndexError:
+            return [tuple(record[i] if i < len(record) else None for i in self.indexes)
+                    for record in data]
+
+class FieldProjection:
+    """
+    Keeps only the selected fields of JSON rows.
+    This class conforms to the DataProcessor protocol from q6_data_processor_protocol.
+    """
+    
+    def __init__(self, names: List[str]):
+        """
+        Initialize a projection.
+        
+        Args:
+            names: Names of the fields to keep, in output order
+        """
+        self.names = names
+    
+    def process(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Project each row onto the selected fields; missing fields become None.
+        
+        Args:
+            data: JSON rows
+        
+        Returns:
+            The projected rows
+        """
+        names = self.names
+        return [{name: row.get(name) for name in names} for row in data]
+
+def build_csv_processors(fieldnames: List[str], select: Optional[List[str]] = None,
+                         where: Optional[List[str]] = None) -> Tuple[List[DataProcessor], List[int]]:
+    """
+    Build the processors that push --where and --select down into CSV parsing.
+    
+    Rows are filtered on their raw values first, so rejected rows are never
+    converted or turned into dicts, and then projected, so unselected columns
+    are never converted.
+    
+    Args:
+        fieldnames: Column names from the header row
+        select: Names of the columns to keep, or None for all
+        where: Predicates that rows must match
+    
+    Returns:
+        Tuple[List[DataProcessor], List[int]]: The processors and the indexes of the output columns
+    
+    Raises:
+        ValueError: If a column is unknown or a predicate is malformed
+    """
+    index = {name: i for i, name in enumerate(fieldnames)}
+    
+    def column_index(name: str) -> int:
+        if name not in index:
+            raise ValueError(f"Unknown column '{name}'")
+        return index[name]
+    
+    processors = []
+    if where:
+        predicates = []
+        for text in where:
+            name, test = compile_predicate(text)
+            predicates.append((column_index(name), test))
+        processors.append(RowFilter(predicates))
+    
+    indexes = list(range(len(fieldnames)))
+    if select:
+        indexes = [column_index(name) for name in select]
+        processors.append(ColumnProjection(indexes))
+    return processors, indexes
+
+def build_json_processors(select: Optional[List[str]] = None,
+                          where: Optional[List[str]] = None) -> List[DataProcessor]:
+    """
+    Build the processors that apply --where and --select to parsed JSON rows.
+    
+    Args:
+        select: Names of the fields to keep, or None for all
+        where: Predicates that rows must match
+    
+    Returns:
+        List[DataProcessor]: The processors, in the order to apply them
+    
+    Raises:
+        ValueError: If a predicate is malformed
+    """
+    processors = []
+    if where:
+        processors.append(RowFilter([compile_predicate(text) for text in where]))
+    if select:
+        processors.append(FieldProjection(select))
+    return processors
+
+def iter_csv_batches(file_path: str, fieldnames: List[str], start_offset: int = 0,
+                     batch_size: int = DEFAULT_BATCH_SIZE,
+                     converters: Optional[List[Optional[Callable[[List[Any]], List[Any]]]]] = None,
+                     processors: Optional[List[DataProcessor]] = None, complete_lines: bool = False
+                     ) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Read the data rows of a CSV file in batches, starting at a byte offset.
+    
+    With converters or processors, each batch is read as raw records, passed
+    through the processors, and only then converted column by column and turned
+    into dicts. In that case fieldnames and converters describe the columns the
+    processors produce.
+    
+    Args:
+        file_path: Path to the CSV file
+        fieldnames: Column names of the rows to produce
+        start_offset: Byte offset of the first row to read
+        batch_size: Maximum number of rows read per batch
+        converters: Optional per-column converters from build_converters();
+            without them every value is a string
+        processors: Optional DataProcessors applied to each batch of raw records
+        complete_lines: Leave a last line without a newline, or a last record whose
+            quoted field is still open, unread (see _read_lines())
+    
+    Yields:
+        Tuple[List[Dict[str, Any]], int]: The rows of a batch and the byte offset
+        just past its last row. A batch may be empty when every row was filtered out.
+    """
+    if converters is None and processors:
+        converters = [None] * len(fieldnames)
+    
+    def finish(batch):
+        if converters is None:
+            return batch
+        for processor in processors or ():
+            batch = apply_processor(processor, batch)
+        return _typed_rows(batch, fieldnames, converters) if batch else []
+    
+    with open(file_path, 'rb') as f:
+        f.seek(start_offset)
+        position = [start_offset]
+        lines = _read_lines(f, position, complete_lines)
+        if converters is None:
+            reader = csv.DictReader(lines, fieldnames=fieldnames)
+        else:
+            # Skip blank lines like DictReader does, then convert whole batches at once
+            reader = filter(None, csv.reader(lines))
+        batch = []
+        end = start_offset
+        for row in reader:
+            if complete_lines and _ended_by_eof(lines):
+                # The record is still being written; leave it for a later import
+                break
+            batch.append(row)
+            end = position[0]
+            if len(batch) >= batch_size:
+                yield finish(batch), end
+                batch = []
+        if batch:
+            yield finish(batch), end
+
+def iter_json_batches(file_path: str, start_row: int = 0, batch_size: int = DEFAULT_BATCH_SIZE,
+                      processors: Optional[List[DataProcessor]] = None
+                      ) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Read the records of a JSON file in batches, starting at a record index.
+    
+    JSON has no record boundaries to seek to, so the whole file is parsed and
+    the offset of a batch is the index of the record following it.
+    
+    Args:
+        file_path: Path to the JSON file
+        start_row: Index of the first record to return
+        batch_size: Maximum number of records per batch
+        processors: Optional DataProcessors applied to each batch
+    
+    Yields:
+        Tuple[List[Dict[str, Any]], int]: The records of a batch and the index
+        of the record following it
+    
+    Raises:
+        ValueError: If the file does not contain a JSON array of records
+    """
+    data = read_json_file(file_path)
+    if not isinstance(data, list):
+        raise ValueError(f"'{file_path}' does not contain a JSON array of records")
+    for start in range(start_row, len(data), batch_size):
+        batch = data[start:start + batch_size]
+        end = start + len(batch)
+        for processor in processors or ():
+            batch = apply_processor(processor, batch)
+        yield batch, end
+
+class BatchWriter:
+    """
+    Writes rows to a stream batch by batch in JSON, CSV or JSON Lines format.
+    The complete output is identical to what process_data() prints for the same rows.
+    """
+    
+    def __init__(self, stream: TextIO, output_format: str, rows_written: int = 0,
+                 fieldnames: Optional[List[str]] = None):
+        """
+        Initialize a writer, optionally continuing output that was already written.
+        
+        Args:
+            stream: Text stream to write to
+            output_format: Format to output the data ('json', 'csv' or 'jsonl')
+            rows_written: Number of rows already present in the stream
+            fieldnames: CSV columns already written to the stream header
+        """
+        self.stream = stream
+        self.output_format = output_format
+        self.rows_written = rows_written
+        self.fieldnames = fieldnames
+        self._csv_writer = None
+    
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of rows to the stream.
+        
+        Args:
+            rows: List of dictionaries to write
+        """
+        if not rows:
+            return
+        if self.output_format == 'json':
+            # Indent every record by one level so the result matches json.dumps(data, indent=2)
+            parts = []
+            for row in rows:
+                parts.append(',\n  ' if self.rows_written else '[\n  ')
+                parts.append(json.dumps(row, indent=2).replace('\n', '\n  '))
+                self.rows_written += 1
+            self.stream.write(''.join(parts))
+        elif self.output_format == 'jsonl':
+            # One compact JSON document per line
+            dumps = json.JSONEncoder(separators=(',', ':')).encode
+            self.stream.write(''.join([dumps(row) + '\n' for row in rows]))
+            self.rows_written += len(rows)
+        else:  # csv
+            if self._csv_writer is None:
+                # Get fieldnames from the first dictionary unless continuing earlier output
+                if self.fieldnames is None:
+                    self.fieldnames = list(rows[0].keys())
+                self._csv_writer = csv.DictWriter(self.stream, fieldnames=self.fieldnames)
+                if self.rows_written == 0:
+                    self._csv_writer.writeheader()
+            self._csv_writer.writerows(rows)
+            self.rows_written += len(rows)
+    
+    def close(self) -> None:
+        """
+        Finish the output (closing the JSON array) without closing the stream.
+        """
+        if self.output_format == 'json':
+            self.stream.write('\n]\n' if self.rows_written else '[]\n')
+        elif self.output_format == 'csv' and self.rows_written == 0:
+            self.stream.write("No data to output\n")
+
+class RecordStreamWriter:
+    """
+    Writes rows as a stream of length-prefixed pickle or marshal frames.
+    
+    The stream starts with a magic header, followed by one frame per batch:
+    a 4-byte little-endian length and the serialized list of rows.
+    """
+    
+    def __init__(self, stream: BinaryIO, output_format: str, rows_written: int = 0,
+                 fieldnames: Optional[List[str]] = None):
+        """
+        Initialize a writer, optionally continuing output that was already written.
+        
+        Args:
+            stream: Binary stream to write to
+            output_format: 'pickle' or 'marshal'
+            rows_written: Number of rows already present in the stream
+            fieldnames: Unused, accepted for compatibility with BatchWriter
+        """
+        self.stream = stream
+        self.output_format = output_format
+        self.rows_written = rows_written
+        self.fieldnames = fieldnames
+        if output_format == 'pickle':
+            self._dumps = lambda rows: pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            self._dumps = marshal.dumps
+    
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of rows as a single frame.
+        
+        Args:
+            rows: List of dictionaries to write
+        """
+        if not rows:
+            return
+        payload = self._dumps(rows)
+        # The header goes out with the first rows, so a checkpoint never records it separately
+        header = _RECORD_STREAM_MAGIC[self.output_format] if self.rows_written == 0 else b''
+        self.stream.write(header + _FRAME_HEADER.pack(len(payload)) + payload)
+        self.rows_written += len(rows)
+    
+    def close(self) -> None:
+        """
+        Finish the output without closing the stream.
+        """
+        if self.rows_written == 0:
+            self.stream.write(_RECORD_STREAM_MAGIC[self.output_format])
+
+def _pad(length: int) -> bytes:
+    """
+    Return the padding that aligns a section of the given length to 8 bytes.
+    """
+    return b'\0' * (-length % 8)
+
+def _encode_column(values: List[Any]) -> Tuple[bytes, Optional[bytes], bytes]:
+    """
+    Encode one column of a batch for the columnar format.
+    
+    Columns holding only ints (within int64), only floats or only bools are
+    stored as raw arrays, and columns of only strings as an array of end
+    offsets followed by the UTF-8 data. None values are recorded in a mask.
+    Any other mix is pickled so that every value round-trips exactly.
+    
+    Args:
+        values: The values of the column
+    
+    Returns:
+        Tuple[bytes, Optional[bytes], bytes]: The type code, the null mask
+        (None if there are no nulls) and the encoded data
+    """
+    present = [value for value in values if value is not None]
+    mask = None if len(present) == len(values) else bytes(value is not None for value in values)
+    types = set(map(type, present))
+    
+    if not present:
+        return b'n', None, b''
+    if types == {str}:
+        # Nulls take no space in the string data
+        encoded = [b'' if value is None else value.encode('utf-8') for value in values]
+        ends = array.array('Q', itertools.accumulate(map(len, encoded)))
+        return b's', mask, ends.tobytes() + b''.join(encoded)
+    if types == {int} and -2 ** 63 <= min(present) and max(present) < 2 ** 63:
+        data = array.array('q', [0 if value is None else value for value in values])
+        return b'q', mask, data.tobytes()
+    if types == {float}:
+        data = array.array('d', [0.0 if value is None else value for value in values])
+        return b'd', mask, data.tobytes()
+    if types == {bool}:
+        return b'?', mask, bytes(value is True for value in values)
+    return b'p', None, pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _mark_absent(mask: Optional[bytes], values: List[Any], has_key: List[bool]) -> Optional[bytes]:
+    """
+    Record in a column's null mask which rows don't have the column's key at all,
+    so they read back without it rather than with a None value.
+    
+    Args:
+        mask: The null mask from _encode_column(), or None
+        values: The values of the column, None for rows without the key
+        has_key: For each row, whether it has the column's key
+    
+    Returns:
+        Optional[bytes]: The mask with _MASK_ABSENT for the rows without the key
+    """
+    if all(has_key):
+        return mask
+    if mask is None:
+        mask = bytes(value is not None for value in values)
+    return bytes(code if key else _MASK_ABSENT for code, key in zip(mask, has_key))
+
+class ColumnarWriter:
+    """
+    Writes rows in a simple columnar binary layout that can be memory-mapped for reading.
+    
+    The file starts with a magic header and the byte order of the arrays.
+    Each batch is then stored as a block: the row and column counts, followed
+    by each column's header (name length, type code, null flag, data length),
+    its name, its null mask if any, and its data. Every section is padded to
+    8 bytes so numeric columns can be viewed in place with memoryview.cast().
+    The mask has one byte per row: 1 for a value, 0 for None and 2 for a row
+    without the column's key, so rows read back with the keys they were written with.
+    """
+    
+    def __init__(self, stream: BinaryIO, output_format: str = 'columnar', rows_written: int = 0,
+                 fieldnames: Optional[List[str]] = None):
+        """
+        Initialize a writer, optionally continuing output that was already written.
+        
+        Args:
+            stream: Binary stream to write to
+            output_format: Always 'columnar', accepted for compatibility with BatchWriter
+            rows_written: Number of rows already present in the stream
+            fieldnames: Unused, accepted for compatibility with BatchWriter
+        """
+        self.stream = stream
+        self.output_format = output_format
+        self.rows_written = rows_written
+        self.fieldnames = fieldnames
+    
+    def _file_header(self) -> bytes:
+        header = _COLUMNAR_MAGIC + (b'<' if sys.byteorder == 'little' else b'>')
+        return header + _pad(len(header))
+    
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of rows as one block.
+        Columns are the union of the keys of the rows; rows missing a key are marked in its mask.
+        
+        Args:
+            rows: List of dictionaries to write
+        
+        Raises:
+            ValueError: If a column name is not a string
+        """
+        if not rows:
+            return
+        names = list(dict.fromkeys(key for row in rows for key in row))
+        if not all(isinstance(name, str) for name in names):
+            raise ValueError("Columnar output needs string column names")
+        
+        parts = [self._file_header()] if self.rows_written == 0 else []
+        parts.append(_BLOCK_HEADER.pack(len(rows), len(names)))
+        # A row with as many keys as the block has columns has all of them
+        ragged = any(len(row) != len(names) for row in rows)
+        for name in names:
+            values = [row.get(name) for row in rows]
+            code, mask, data = _encode_column(values)
+            if ragged:
+                mask = _mark_absent(mask, values, [name in row for row in rows])
+            encoded_name = name.encode('utf-8')
+            column_header = _COLUMN_HEADER.pack(len(encoded_name), code, b'\1' if mask else b'\0', len(data))
+            parts += [column_header, encoded_name, _pad(len(column_header) + len(encoded_name))]
+            if mask:
+                parts += [mask, _pad(len(mask))]
+            parts += [data, _pad(len(data))]
+        self.stream.write(b''.join(parts))
+        self.rows_written += len(rows)
+    
+    def close(self) -> None:
+        """
+        Finish the output without closing the stream.
+        """
+        if self.rows_written == 0:
+            self.stream.write(self._file_header())
+
+# Any of the writers returned by make_writer()
+RowWriter = Union[BatchWriter, RecordStreamWriter, ColumnarWriter]
+
+def make_writer(stream: Union[TextIO, BinaryIO], output_format: str, rows_written: int = 0,
+                fieldnames: Optional[List[str]] = None) -> RowWriter:
+    """
+    Create the writer for an output format.
+    
+    Args:
+        stream: Stream to write to; binary for BINARY_FORMATS, text otherwise
+        output_format: One of OUTPUT_FORMATS
+        rows_written: Number of rows already present in the stream
+        fieldnames: CSV columns already written to the stream header
+    
+    Returns:
+        RowWriter: A BatchWriter, RecordStreamWriter or ColumnarWriter
+    """
+    if output_format in ('pickle', 'marshal'):
+        return RecordStreamWriter(stream, output_format, rows_written, fieldnames)
+    if output_format == 'columnar':
+        return ColumnarWriter(stream, output_format, rows_written, fieldnames)
+    return BatchWriter(stream, output_format, rows_written, fieldnames)
+
+def open_output(path: str, output_format: str, mode: str = 'w') -> Union[TextIO, BinaryIO]:
+    """
+    Open an output file in binary or text mode, as its format requires.
+    
+    Args:
+        path: Path to the output file
+        output_format: One of OUTPUT_FORMATS
+        mode: 'w' to create the file, 'r+' to continue writing it or 'a' to append to it
+    
+    Returns:
+        Union[TextIO, BinaryIO]: The open file
+    """
+    if output_format in BINARY_FORMATS:
+        return open(path, mode + 'b')
+    return open(path, mode, newline='', encoding='utf-8')
+
+def append_output(path: str, output_format: str) -> Tuple[Union[TextIO, BinaryIO], RowWriter]:
+    """
+    Open an output file to append the rows of an incremental import to.
+    
+    Earlier runs only import new rows, so their output has to be kept. A writer
+    only needs to know whether the file already holds rows (so it writes no second
+    header) and, for CSV, which columns its header names.
+    
+    Args:
+        path: Path to the output file, which may not exist yet
+        output_format: One of OUTPUT_FORMATS except 'json', whose closing bracket
+            can't be appended after
+    
+    Returns:
+        Tuple[Union[TextIO, BinaryIO], RowWriter]: The open file and a writer continuing it
+    """
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    fieldnames = None
+    if output_format == 'csv' and size:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f), None)
+    out = open_output(path, output_format, 'a')
+    return out, make_writer(out, output_format, 1 if size else 0, fieldnames)
+
+def iter_columnar_blocks(file_path: str) -> Iterator[Tuple[int, Dict[str, Tuple[Any, Optional[memoryview]]]]]:
+    """
+    Memory-map a columnar file and yield its blocks column by column.
+    
+    Numeric and bool columns are returned as memoryviews into the mapping, so
+    they are not copied until used; the mapping stays open while any view is alive.
+    Placeholders stand in for nulls and absent values, so check the mask where one is given.
+    
+    Args:
+        file_path: Path to a file written by ColumnarWriter
+    
+    Yields:
+        Tuple[int, Dict[str, Tuple[Any, Optional[memoryview]]]]: The number of rows
+        in the block and, per column, its values and null mask (1 = value,
+        0 = None, 2 = the row doesn't have the key)
+    
+    Raises:
+        ValueError: If the file is not in the columnar format
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"'{file_path}' is not a columnar file")
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    
+    magic_length = len(_COLUMNAR_MAGIC)
+    if bytes(view[:magic_length]) != _COLUMNAR_MAGIC:
+        raise ValueError(f"'{file_path}' is not a columnar file")
+    swap = view[magic_length:magic_length + 1].tobytes() != (b'<' if sys.byteorder == 'little' else b'>')
+    pos = magic_length + 1
+    pos += -pos % 8
+    
+    def section(length):
+        # Every section ends on an 8-byte boundary of the file
+        nonlocal pos
+        data = view[pos:pos + length]
+        pos += length
+        pos += -pos % 8
+        return data
+    
+    while pos < len(view):
+        nrows, ncols = _BLOCK_HEADER.unpack_from(view, pos)
+        pos += _BLOCK_HEADER.size
+        columns = {}
+        for _ in range(ncols):
+            name_length, code, has_mask, data_length = _COLUMN_HEADER.unpack_from(view, pos)
+            pos += _COLUMN_HEADER.size
+            name = section(name_length).tobytes().decode('utf-8')
+            mask = section(nrows) if has_mask == b'\1' else None
+            data = section(data_length)
+            code = code.decode('ascii')
+            if code in _ARRAY_TYPES:
+                if swap and code != '?':
+                    values = array.array(code, data.tobytes())
+                    values.byteswap()
+                else:
+                    values = data.cast(code)
+            elif code == 's':
+                offsets = array.array('Q', data[:8 * nrows].tobytes())
+                if swap:
+                    offsets.byteswap()
+                blob = data[8 * nrows:].tobytes()
+                start = 0
+                values = []
+                for end in offsets:
+                    values.append(blob[start:end].decode('utf-8'))
+                    start = end
+            elif code == 'n':
+                values = [None] * nrows
+            else:  # pickled
+                values = pickle.loads(data)
+            columns[name] = (values, mask)
+        yield nrows, columns
+
+def read_output(file_path: str, output_format: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read back rows written by the importer in any output format.
+    
+    Note that the pickle format must only be read from trusted files, since
+    unpickling can run arbitrary code.
+    
+    Args:
+        file_path: Path to the output file
+        output_format: One of OUTPUT_FORMATS
+    
+    Yields:
+        Dict[str, Any]: The rows, in order
+    
+    Raises:
+        ValueError: If the file is not in the given binary format
+    """
+    if output_format == 'json':
+        with open(file_path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+    elif output_format == 'jsonl':
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+    elif output_format == 'csv':
+        with open(file_path, 'r', newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+    elif output_format in ('pickle', 'marshal'):
+        loads = pickle.loads if output_format == 'pickle' else marshal.loads
+        magic = _RECORD_STREAM_MAGIC[output_format]
+        with open(file_path, 'rb') as f:
+            if f.read(len(magic)) != magic:
+                raise ValueError(f"'{file_path}' is not a {output_format} record stream")
+            while True:
+                header = f.read(_FRAME_HEADER.size)
+                if not header:
+                    break
+                (length,) = _FRAME_HEADER.unpack(header)
+                yield from loads(f.read(length))
+    else:  # columnar
+        for nrows, columns in iter_columnar_blocks(file_path):
+            names = list(columns)
+            lists = []
+            # Masks of the columns some rows don't have, to leave their keys out
+            absent = []
+            for name, (values, mask) in columns.items():
+                if not isinstance(values, list):
+                    values = values.tolist()
+                if mask is not None:
+                    values = [value if code == _MASK_PRESENT else None for value, code in zip(values, mask)]
+                    if _MASK_ABSENT in mask.tobytes():
+                        absent.append((name, mask))
+                lists.append(values)
+            for i, values in enumerate(zip(*lists) if lists else [()] * nrows):
+                row = dict(zip(names, values))
+                for name, mask in absent:
+                    if mask[i] == _MASK_ABSENT:
+                        del row[name]
+                yield row
+
 def process_data(data: List[Dict[str, Any]], output_format: str) -> None:
     """
     Process the data and output it in the specified format.
     
     Args:
         data: List of dictionaries containing the data
-        output_format: Format to output the data ('json' or 'csv')
+        output_format: Format to output the data (one of OUTPUT_FORMATS)
     """
     if output_format == 'json':
         # Output as JSON with pretty printing
         print(json.dumps(data, indent=2))
+    elif output_format != 'csv':
+        # JSON Lines and the binary formats go through their writers
+        sys.stdout.flush()
+        stream = sys.stdout.buffer if output_format in BINARY_FORMATS else sys.stdout
+        writer = make_writer(stream, output_format)
+        writer.write_batch(data)
+        writer.close()
+        stream.flush()
     else:  # csv
         if not data:
             print("No data to output")
@@ -78,6 +1172,255 @@ def process_data(data: List[Dict[str, Any]], output_format: str) -> None:
         writer.writeheader()
         writer.writerows(data)
 
+def head_hash(file_path: str, length: int) -> str:
+    """
+    Hash the first bytes of a file to recognise it later.
+    
+    Args:
+        file_path: Path to the file
+        length: Number of leading bytes to hash
+    
+    Returns:
+        str: Hex digest of the leading bytes
+    """
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+def load_state(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a checkpoint or manifest file.
+    
+    Args:
+        path: Path to the state file
+    
+    Returns:
+        Optional[Dict[str, Any]]: The saved state, or None if there is none
+    """
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_state(path: str, state: Dict[str, Any]) -> None:
+    """
+    Atomically save a checkpoint or manifest file.
+    The state is written to a temporary file first so a crash never leaves a torn file.
+    
+    Args:
+        path: Path to the state file
+        state: JSON-serialisable state to save
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def import_file(file_path: str, writer: RowWriter, offset: int = 0,
+                fieldnames: Optional[List[str]] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                on_commit=None, schema: Optional[Dict[str, str]] = None,
+                select: Optional[List[str]] = None, where: Optional[List[str]] = None,
+                complete_lines: bool = False) -> Tuple[int, Optional[List[str]]]:
+    """
+    Import one JSON or CSV file through a writer, batch by batch.
+    
+    Args:
+        file_path: Path to the input file
+        writer: Writer that receives the rows
+        offset: Byte offset (CSV) or record index (JSON) to start from
+        fieldnames: CSV header, required when starting past the header row
+        batch_size: Maximum number of rows per batch
+        on_commit: Optional callback called as on_commit(offset, fieldnames) after each batch
+        schema: Optional CSV column types for typed reading (see build_converters())
+        select: Optional names of the columns to output
+        where: Optional predicates rows must match to be output (see compile_predicate())
+        complete_lines: Leave a last CSV record that isn't complete yet for a later import
+    
+    Returns:
+        Tuple[int, Optional[List[str]]]: The offset where the import stopped and the CSV header
+    
+    Raises:
+        ValueError: If select or where name an unknown CSV column, a predicate is
+            malformed, a value doesn't parse as the type the schema gives its
+            column or a JSON file does not contain an array of records
+    """
+    if file_path.endswith('.csv'):
+        if fieldnames is None:
+            fieldnames, offset = read_csv_header(file_path, complete_lines)
+            if fieldnames is None:
+                return offset, None
+        processors, indexes = build_csv_processors(fieldnames, select, where)
+        converters = None
+        if schema is not None:
+            converters = build_converters(file_path, fieldnames, schema)
+            converters = [converters[i] for i in indexes]
+        batches = iter_csv_batches(file_path, [fieldnames[i] for i in indexes], offset,
+                                   batch_size, converters, processors, complete_lines)
+    else:
+        batches = iter_json_batches(file_path, offset, batch_size, build_json_processors(select, where))
+    
+    for rows, offset in batches:
+        writer.write_batch(rows)
+        if on_commit is not None:
+            on_commit(offset, fieldnames)
+    return offset, fieldnames
+
+def import_with_checkpoint(file_path: str, output_path: str, output_format: str,
+                           batch_size: int = DEFAULT_BATCH_SIZE, resume: bool = False,
+                           read_options: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Import a file into an output file, checkpointing after every batch.
+    
+    After each batch the output is flushed to disk and the input offset, row count
+    and output size are recorded in a sidecar file next to the input. Resuming
+    truncates the output back to the last committed batch and seeks the input
+    straight to the recorded offset. The output format and read options are
+    recorded too, and resuming with different ones is refused.
+    
+    Args:
+        file_path: Path to the input file
+        output_path: Path to the output file
+        output_format: Format to output the data ('json' or 'csv')
+        batch_size: Number of rows per committed batch
+        resume: Continue from the checkpoint if one exists
+        read_options: Optional keyword arguments for import_file() (schema, select, where)
+    """
+    checkpoint_path = file_path + CHECKPOINT_SUFFIX
+    checkpoint = load_state(checkpoint_path) if resume else None
+    read_options = read_options or {}
+    # The options that shape the rows, as recorded in the checkpoint
+    options = {'schema': read_options.get('schema'), 'select': read_options.get('select'),
+               'where': list(read_options.get('where') or [])}
+    if resume and checkpoint is None:
+        print(f"No checkpoint found for '{file_path}', starting from the beginning", file=sys.stderr)
+    
+    if checkpoint is not None:
+        # Refuse to resume against a different input or output than the checkpoint describes
+        size = os.path.getsize(file_path)
+        if (checkpoint['format'] != output_format or size < checkpoint['size']
+                or head_hash(file_path, checkpoint['head_bytes']) != checkpoint['head_hash']):
+            print(f"Error: '{file_path}' does not match its checkpoint, cannot resume")
+            sys.exit(1)
+        # Rows of a different shape can't be appended to the output written so far
+        if checkpoint.get('read_options', {'schema': None, 'select': None, 'where': []}) != options:
+            print(f"Error: The import of '{file_path}' was started with different "
+                  "--typed/--schema/--select/--where options, cannot resume")
+            sys.exit(1)
+        if not os.path.exists(output_path) or os.path.getsize(output_path) < checkpoint['output_offset']:
+            print(f"Error: '{output_path}' is missing output recorded in the checkpoint, cannot resume")
+            sys.exit(1)
+        out = open_output(output_path, output_format, 'r+')
+        out.truncate(checkpoint['output_offset'])
+        out.seek(checkpoint['output_offset'])
+        writer = make_writer(out, output_format, checkpoint['rows'], checkpoint['columns'])
+        offset, fieldnames = checkpoint['offset'], checkpoint['fieldnames']
+    else:
+        out = open_output(output_path, output_format)
+        writer = make_writer(out, output_format)
+        offset, fieldnames = 0, None
+    
+    head_bytes = min(os.path.getsize(file_path), HEAD_HASH_BYTES)
+    state = {'format': output_format, 'read_options': options, 'head_bytes': head_bytes,
+             'head_hash': head_hash(file_path, head_bytes)}
+    
+    def commit(offset: int, fieldnames: Optional[List[str]]) -> None:
+        # Make the batch durable before recording it as committed
+        out.flush()
+        os.fsync(out.fileno())
+        state.update(offset=offset, fieldnames=fieldnames, rows=writer.rows_written,
+                     columns=writer.fieldnames, output_offset=out.tell(),
+                     size=os.path.getsize(file_path))
+        save_state(checkpoint_path, state)
+    
+    with out:
+        import_file(file_path, writer, offset, fieldnames, batch_size, commit, **read_options)
+        writer.close()
+    
+    # The import finished, so there is nothing left to resume
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+def list_input_files(path: str) -> List[str]:
+    """
+    List the JSON and CSV files to import from a file or directory path.
+    
+    Args:
+        path: Path to an input file or a directory of input files
+    
+    Returns:
+        List[str]: Input file paths in sorted order, skipping hidden files such as the manifest
+    """
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(entry.path for entry in os.scandir(path)
+                  if entry.is_file() and not entry.name.startswith('.')
+                  and entry.name.endswith(('.json', '.csv')))
+
+def plan_incremental(file_path: str, st: os.stat_result,
+                     entry: Optional[Dict[str, Any]]) -> Optional[Tuple[int, Optional[List[str]]]]:
+    """
+    Decide how much of a file still has to be imported.
+    
+    A file whose size and mtime match the manifest is skipped without being opened.
+    A CSV file that grew and still starts with the same bytes only has its
+    appended tail imported. Anything else is imported from the start.
+    
+    CSV files are imported up to their last complete record: a row still being
+    written has no newline yet, or ends inside a quoted field, and is picked up
+    once the file grows again.
+    
+    Args:
+        file_path: Path to the input file
+        st: Current stat result of the file
+        entry: Manifest entry from the previous import, if any
+    
+    Returns:
+        Optional[Tuple[int, Optional[List[str]]]]: Offset and CSV header to import
+        from, or None if there is nothing new
+    """
+    if entry is None:
+        return 0, None
+    if st.st_size == entry['size'] and st.st_mtime_ns == entry['mtime_ns']:
+        return None
+    if (file_path.endswith('.csv') and st.st_size >= entry['size']
+            and head_hash(file_path, entry['head_bytes']) == entry['head_hash']):
+        if st.st_size == entry['size']:
+            return None
+        return entry['offset'], entry['fieldnames']
+    return 0, None
+
+def import_incremental(paths: List[str], manifest_path: str, writer: RowWriter,
+                       batch_size: int = DEFAULT_BATCH_SIZE, read_options: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Import only the files, or appended tails of files, not imported before.
+    
+    Args:
+        paths: Input file paths
+        manifest_path: Path to the manifest recording earlier imports
+        writer: Writer that receives the new rows
+        batch_size: Maximum number of rows per batch
+        read_options: Optional keyword arguments for import_file() (schema, select, where)
+    """
+    manifest = load_state(manifest_path) or {}
+    try:
+        for file_path in paths:
+            key = os.path.abspath(file_path)
+            st = os.stat(file_path)
+            plan = plan_incremental(file_path, st, manifest.get(key))
+            if plan is None:
+                # Remember the new mtime of a touched but unchanged file so it isn't hashed again
+                manifest[key]['mtime_ns'] = st.st_mtime_ns
+                continue
+            offset, fieldnames = import_file(file_path, writer, plan[0], plan[1], batch_size,
+                                             complete_lines=True, **(read_options or {}))
+            head_bytes = min(st.st_size, HEAD_HASH_BYTES)
+            manifest[key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                             'head_bytes': head_bytes, 'head_hash': head_hash(file_path, head_bytes),
+                             'offset': offset, 'fieldnames': fieldnames}
+    finally:
+        # Record whatever was imported, even if a later file failed
+        save_state(manifest_path, manifest)
+
 def main():
     """
     Main function that sets up the command-line interface and processes data files.
@@ -87,26 +1430,132 @@ def main():
     parser = argparse.ArgumentParser(description='Data importer for JSON and CSV files')
     
     # Add required arguments:
-    # file: Path to the input file
-    # format: Output format (json or csv)
-    parser.add_argument('file', help='Input file path (JSON or CSV)')
-    parser.add_argument('--format', choices=['json', 'csv'], default='json',
-                       help='Output format (default: json)')
+    # file: Path to the input file, or a directory of input files
+    # format: Output format (json, csv, jsonl, pickle, marshal or columnar)
+    # output, resume, incremental, batch-size: Checkpointing and incremental imports
+    # typed, schema: Typed CSV values
+    # select, where: Columns and rows to output
+    # profile, profile-output: Optional cProfile/tracemalloc report of the import
+    parser.add_argument('file', help='Input file path (JSON or CSV) or a directory of them')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json',
+                       help='Output format: pretty-printed json, csv, jsonl (JSON Lines), '
+                            'pickle or marshal record streams, or columnar binary (default: json)')
+    parser.add_argument('--output',
+                       help='Write output to this file instead of stdout, checkpointing after every batch '
+                            '(with --incremental, new rows are appended to it instead)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Resume an interrupted import from its checkpoint (requires --output)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only import files, or appended tails of files, not imported before')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'Rows per batch (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--typed', action='store_true',
+                       help='Convert CSV values to int, float, bool or null using types '
+                            f'inferred from the first {SCHEMA_SAMPLE_ROWS} rows')
+    parser.add_argument('--schema',
+                       help='Explicit CSV column types as name:type,... with types '
+                            f'{", ".join(COLUMN_TYPES)}; every value of these columns must parse '
+                            '(leading zeros allowed); implies --typed for the other columns')
+    parser.add_argument('--select',
+                       help='Comma-separated columns to output (default: all)')
+    parser.add_argument('--where', action='append', default=[],
+                       help="Only output rows matching a predicate such as 'age>=30' "
+                            '(operators: == != >= <= > <); may be repeated')
+    add_profile_arguments(parser)
     
     # Parse the command-line arguments
     args = parser.parse_args()
     
+    # Check the profile mode ($Q_PROFILE may be set to anything) before doing any work
+    try:
+        profile = profile_mode(args.profile)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if args.batch_size <= 0:
+        print("Error: --batch-size must be positive")
+        sys.exit(1)
+    
+    # Typed reading uses the explicit schema and infers any columns it doesn't cover
+    schema = None
+    if args.schema is not None:
+        try:
+            schema = parse_schema(args.schema)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    elif args.typed:
+        schema = {}
+    
+    # Check the predicates up front so mistakes are reported before any output
+    select = [name.strip() for name in args.select.split(',')] if args.select else None
+    try:
+        for text in args.where:
+            compile_predicate(text)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    read_options = {'schema': schema, 'select': select, 'where': args.where}
+    
+    paths = list_input_files(args.file)
+    
     # Determine file type from extension
-    if args.file.endswith('.json'):
-        data = read_json_file(args.file)
-    elif args.file.endswith('.csv'):
-        data = read_csv_file(args.file)
-    else:
-        print("Error: Unsupported file format. Use .json or .csv files")
+    for path in paths:
+        if not path.endswith(('.json', '.csv')):
+            print("Error: Unsupported file format. Use .json or .csv files")
+            sys.exit(1)
+        if not os.path.exists(path):
+            print(f"Error: File '{path}' not found")
+            sys.exit(1)
+    
+    if args.resume and (args.output is None or args.incremental or os.path.isdir(args.file)):
+        print("Error: --resume requires --output and a single input file")
+        sys.exit(1)
+    if args.incremental and args.output and args.format == 'json':
+        print("Error: --incremental --output appends to the output file, use --format jsonl, csv, "
+              "pickle, marshal or columnar")
         sys.exit(1)
     
-    # Process and output the data
-    process_data(data, args.format)
+    try:
+        with profiled(profile, args.profile_output, label=args.file):
+            # A single JSON file printed as JSON is output exactly as parsed, arrays and objects alike
+            if (paths == [args.file] and args.file.endswith('.json') and args.format == 'json'
+                    and not (args.output or args.incremental or select or args.where)):
+                process_data(read_json_file(args.file), 'json')
+                return
+            
+            # A single file written to an output file is checkpointed so it can be resumed
+            if args.output and not args.incremental and not os.path.isdir(args.file):
+                import_with_checkpoint(args.file, args.output, args.format, args.batch_size, args.resume,
+                                       read_options)
+                return
+            
+            if args.output and args.incremental:
+                # Earlier runs wrote the rows they imported, so only add the new ones
+                out, writer = append_output(args.output, args.format)
+            else:
+                if args.output:
+                    out = open_output(args.output, args.format)
+                else:
+                    out = sys.stdout.buffer if args.format in BINARY_FORMATS else sys.stdout
+                writer = make_writer(out, args.format)
+            if args.incremental:
+                # Keep the manifest next to the inputs it describes
+                directory = args.file if os.path.isdir(args.file) else os.path.dirname(args.file)
+                import_incremental(paths, os.path.join(directory, MANIFEST_NAME), writer, args.batch_size,
+                                   read_options)
+            else:
+                for path in paths:
+                    import_file(path, writer, batch_size=args.batch_size, **read_options)
+            # An appended CSV file gets no 'No data to output' line, which would become its header
+            if not (args.output and args.incremental and args.format == 'csv' and writer.rows_written == 0):
+                writer.close()
+            if out not in (sys.stdout, sys.stdout.buffer):
+                out.close()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -118,6 +1567,35 @@ if __name__ == '__main__':
 # python q9_data_importer_cli.py data.csv --format csv
 # [Outputs CSV data with headers]
 #
+# python q9_data_importer_cli.py data.csv --typed
+# [Outputs JSON with "age": 30 instead of "age": "30"]
+#
+# python q9_data_importer_cli.py data.csv --schema age:float
+# [Outputs JSON with "age": 30.0, inferring the type of the other columns]
+#
+# python q9_data_importer_cli.py data.csv --select name --where "age>=30"
+# [Outputs only the name column of rows with age 30 or more]
+#
+# python q9_data_importer_cli.py data.csv --typed --format columnar --output data.col
+# [Writes a memory-mappable columnar file; read it back with read_output('data.col', 'columnar')]
+#
+# python q9_data_importer_cli.py big.csv --output big.json
+# [Writes big.json, checkpointing progress to big.csv.checkpoint after every batch]
+#
+# python q9_data_importer_cli.py big.csv --output big.json --resume
+# [Continues an interrupted import from the last committed batch]
+#
+# python q9_data_importer_cli.py big.csv --format jsonl --output big.jsonl --profile cprofile
+# [Imports big.csv and reports the 20 most expensive functions on stderr;
+#  Q_PROFILE=tracemalloc reports peak memory and allocation sites instead]
+#
+# python q9_data_importer_cli.py incoming/ --incremental --format csv
+# [Outputs only rows from files, or appended tails, not imported before;
+#  progress is remembered in incoming/.import_manifest.json]
+#
+# python q9_data_importer_cli.py incoming/ --incremental --format jsonl --output all.jsonl
+# [Appends the new rows to all.jsonl, which keeps the rows of earlier runs]
+#
 # Example JSON file (data.json):
 # [
 #   {"name": "John", "age": 30},
@@ -127,4 +1605,4 @@ if __name__ == '__main__':
 # Example CSV file (data.csv):
 # name,age
 # John,30
-# Jane,25 
\ No newline at end of file
+# Jane,25
\ No newline at end of file